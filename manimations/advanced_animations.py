@@ -1,6 +1,13 @@
 from manim import *
 import numpy as np
 
+from drawing import DoublePendulums, EpicycleSystem
+from dynamics import release_double_pendulums, sample, simulate
+from epicycles import terms
+from fluids import fluid_tracers, wrap
+from particles import MoveParticles, ParticleCloud, spiral
+from raster import MandelbrotImage
+
 
 class ComplexFourierEpicycles(Scene):
     """Advanced Fourier epicycles with multiple rotating circles"""
@@ -10,89 +17,67 @@ class ComplexFourierEpicycles(Scene):
         speeds = [1, -2, 3, -5, 8]  # Mix of clockwise and counter-clockwise
         colors = [BLUE, GREEN, YELLOW, ORANGE, RED]
 
-        circles = VGroup()
-        for r, color in zip(radii, colors):
-            circle = Circle(radius=r, color=color, stroke_width=2.5)
-            circles.add(circle)
-
-        dots = VGroup()
-        for _ in range(len(radii)):
-            dot = Dot(color=WHITE, radius=0.08)
-            dots.add(dot)
+        system = EpicycleSystem(*terms(radii, speeds), colors=colors, circle_width=2.5, tip_radius=0.08)
 
-        # Show initial circles
-        self.play(Create(circles[0]), run_time=0.8)
-
-        # Animate nested rotations
-        for i in range(len(circles)):
-            if i > 0:
-                self.play(Create(circles[i]), run_time=0.5)
+        # Show the circles one after another, outermost first
+        self.play(Create(system.circles[0]), run_time=0.8)
+        for circle in system.circles[1:]:
+            self.play(Create(circle), run_time=0.5)
+        self.play(FadeIn(system.arms, system.tip), run_time=0.5)
+        self.add(system)
 
         # Complex rotation pattern
-        self.play(
-            *[Rotate(circles[i], angle=TAU * speeds[i] * 0.5, about_point=ORIGIN if i == 0 else circles[i-1].get_center())
-              for i in range(len(circles))],
-            run_time=4
-        )
+        t = ValueTracker(0)
+        system.add_updater(lambda m: m.set_time(t.get_value()))
+        self.play(t.animate.set_value(PI), run_time=4)
+        system.clear_updaters()
 
         self.wait(0.5)
 
 
 class FluidParticles(Scene):
-    """Advanced particle system with wave propagation"""
-    def construct(self):
-        # Create particle grid
-        num_particles_x = 25
-        num_particles_y = 15
-        particles = VGroup()
-
-        for i in range(num_particles_x):
-            for j in range(num_particles_y):
-                x = (i - num_particles_x/2) * 0.35
-                y = (j - num_particles_y/2) * 0.35
-
-                particle = Dot(
-                    point=np.array([x, y, 0]),
-                    radius=0.05,
-                    color=interpolate_color(BLUE, PURPLE, i/num_particles_x)
-                )
-                particles.add(particle)
+    """Particles carried by a stirred fluid"""
+    num_particles_x = 25
+    num_particles_y = 15
+    spacing = 0.35
+    particle_size = 0.1
 
-        self.play(FadeIn(particles, lag_ratio=0.002), run_time=1.5)
-
-        # Create wave effect
-        animations = []
-        for particle in particles:
-            pos = particle.get_center()
-            x, y = pos[0], pos[1]
-
-            # Wave displacement
-            wave_offset = UP * 0.5 * np.sin(x * 1.5) * np.cos(y * 1.5)
-            new_pos = pos + wave_offset
+    def construct(self):
+        # Create particle grid, all particles in one point cloud
+        nx, ny = self.num_particles_x, self.num_particles_y
+        i, j = np.meshgrid(np.arange(nx), np.arange(ny), indexing="ij")
+        base = np.stack([(i - nx/2) * self.spacing, (j - ny/2) * self.spacing], axis=-1).reshape(-1, 2)
 
-            animations.append(particle.animate.move_to(new_pos))
+        stops = np.array([ManimColor(BLUE).to_rgb(), ManimColor(PURPLE).to_rgb()])
+        column = (i / nx).reshape(-1, 1)
+        colors = stops[0] + (stops[1] - stops[0]) * column
 
-        self.play(*animations, run_time=2, rate_func=there_and_back)
+        particles = ParticleCloud(base, colors=colors, size=self.particle_size)
+        self.play(FadeIn(particles), run_time=1.5)
 
-        # Spiral out effect
-        animations = []
-        for particle in particles:
-            pos = particle.get_center()
-            x, y = pos[0], pos[1]
-            angle = np.arctan2(y, x)
-            distance = np.sqrt(x**2 + y**2)
+        # Stir the fluid the particles float in; simulated once, then cached
+        duration, dt = 6, 1 / 30
+        paths = np.concatenate([base[None], simulate(fluid_tracers, base, dt, int(duration / dt))])
+        self.play(
+            MoveParticles(particles, lambda t: wrap(sample(paths, t * duration, dt))),
+            run_time=duration,
+            rate_func=linear,
+        )
 
-            new_distance = distance * 1.5
-            new_pos = np.array([
-                new_distance * np.cos(angle + 0.5),
-                new_distance * np.sin(angle + 0.5),
-                0
-            ])
+        # Spiral out effect from wherever the flow left them
+        self.play(
+            MoveParticles(particles, spiral(wrap(paths[-1])), opacities=lambda t: 1 - 0.7 * t),
+            run_time=2,
+        )
+        self.play(FadeOut(particles), run_time=1)
 
-            animations.append(particle.animate.move_to(new_pos).set_opacity(0.3))
 
-        self.play(*animations, run_time=2)
-        self.play(FadeOut(particles), run_time=1)
+class FluidParticlesDense(FluidParticles):
+    """FluidParticles with 51,000 particles"""
+    num_particles_x = 300
+    num_particles_y = 170
+    spacing = 0.029
+    particle_size = 0.025
 
 
 class FractalTree(Scene):
@@ -159,72 +144,27 @@ class DoublePendulumChaos(Scene):
         L1, L2 = 2.0, 1.8
         origin = UP * 2.5
 
-        # Initial angles
+        # Multiple pendulums with slightly different starting positions
         theta1_vals = [PI/2 + 0.1 * i for i in range(3)]
         theta2 = PI/2
-
-        # Create multiple pendulums with slightly different starting positions
-        pendulum_systems = VGroup()
         colors = [BLUE, GREEN, YELLOW]
 
-        for theta1, color in zip(theta1_vals, colors):
-            # Calculate initial positions
-            p1 = origin + np.array([L1 * np.sin(theta1), -L1 * np.cos(theta1), 0])
-            p2 = p1 + np.array([L2 * np.sin(theta2), -L2 * np.cos(theta2), 0])
-
-            # Create pendulum parts
-            rod1 = Line(origin, p1, color=WHITE, stroke_width=2, stroke_opacity=0.5)
-            rod2 = Line(p1, p2, color=WHITE, stroke_width=2, stroke_opacity=0.5)
-            bob = Dot(p2, color=color, radius=0.12)
-
-            trail = TracedPath(bob.get_center, stroke_color=color, stroke_width=2, stroke_opacity=0.7)
-
-            system = VGroup(rod1, rod2, bob)
-            pendulum_systems.add(system)
-            self.add(system, trail)
+        # Physics simulation, cached on disk between renders
+        dt = 0.03
+        initial = [[theta1, theta2, 0.0, 0.0] for theta1 in theta1_vals]
+        angles, drift = release_double_pendulums(initial, dt, 180, L1=L1, L2=L2, g=9.8)
+        logger.info(f"DoublePendulumChaos: relative energy drift {drift:.1e}")
 
-        # Pivot point
+        pendulums = DoublePendulums(angles, dt, origin, L1, L2, colors)
         pivot = Dot(origin, color=GREY, radius=0.12)
-        self.add(pivot)
-
-        # Animate with physics simulation
-        omega1_vals = [0] * 3
-        omega2_vals = [0] * 3
-        theta1_current = list(theta1_vals)
-        theta2_current = [theta2] * 3
+        self.add(pendulums, pivot)
 
-        dt = 0.03
-        for frame in range(180):
-            for i in range(3):
-                # Simplified pendulum physics
-                g = 9.8
-                m1 = m2 = 1
-
-                # Simplified equations
-                theta1_current[i] += omega1_vals[i] * dt
-                theta2_current[i] += omega2_vals[i] * dt
-
-                omega1_vals[i] += (-g / L1) * np.sin(theta1_current[i]) * dt
-                omega2_vals[i] += (-g / L2) * np.sin(theta2_current[i]) * dt * 1.5
-
-                # Update positions
-                p1 = origin + np.array([
-                    L1 * np.sin(theta1_current[i]),
-                    -L1 * np.cos(theta1_current[i]),
-                    0
-                ])
-                p2 = p1 + np.array([
-                    L2 * np.sin(theta2_current[i]),
-                    -L2 * np.cos(theta2_current[i]),
-                    0
-                ])
-
-                system = pendulum_systems[i]
-                system[0].put_start_and_end_on(origin, p1)
-                system[1].put_start_and_end_on(p1, p2)
-                system[2].move_to(p2)
-
-            self.wait(dt)
+        # One continuous play, every pendulum where it is at the current time
+        duration = (len(angles) - 1) * dt
+        clock = ValueTracker(0)
+        pendulums.add_updater(lambda m: m.set_time(clock.get_value()))
+        self.play(clock.animate.set_value(duration), run_time=duration, rate_func=linear)
+        pendulums.clear_updaters()
 
 
 class LissajousCurves(Scene):
@@ -272,44 +212,23 @@ class LissajousCurves(Scene):
 class MandelBrotSet(Scene):
     """Simplified Mandelbrot set visualization"""
     def construct(self):
-        resolution = 50
+        resolution = 300
         x_range = [-2.5, 1]
         y_range = [-1.25, 1.25]
         max_iter = 30
 
-        dots = VGroup()
-
-        for i in range(resolution):
-            for j in range(resolution):
-                # Map to complex plane
-                x = x_range[0] + (x_range[1] - x_range[0]) * i / resolution
-                y = y_range[0] + (y_range[1] - y_range[0]) * j / resolution
-
-                c = complex(x, y)
-                z = 0
-
-                # Mandelbrot iteration
-                for n in range(max_iter):
-                    if abs(z) > 2:
-                        break
-                    z = z*z + c
-
-                # Color based on iterations
-                if n < max_iter - 1:
-                    color = interpolate_color(BLUE, RED, n / max_iter)
-
-                    # Map to screen coordinates
-                    screen_x = (x + 0.75) * 3.5
-                    screen_y = y * 4
-
-                    dot = Dot(
-                        point=np.array([screen_x, screen_y, 0]),
-                        radius=0.06,
-                        color=color,
-                        fill_opacity=0.8
-                    )
-                    dots.add(dot)
-
-        self.play(FadeIn(dots, lag_ratio=0.0005), run_time=3)
-        self.play(dots.animate.scale(1.5).shift(LEFT * 0.5), run_time=2)
+        # One image instead of one Dot per escaped pixel; screen mapping is
+        # x -> (x + 0.75) * 3.5, y -> y * 4. As before, points escaping on
+        # the last iteration are left out too
+        fractal = MandelbrotImage(
+            x_range, y_range, resolution, max_iter,
+            colors=[BLUE, RED],
+            opacity=0.8,
+            escape_limit=max_iter - 1,
+            width=(x_range[1] - x_range[0]) * 3.5,
+            height=(y_range[1] - y_range[0]) * 4,
+        )
+
+        self.play(FadeIn(fractal), run_time=3)
+        self.play(fractal.animate.scale(1.5).shift(LEFT * 0.5), run_time=2)
         self.wait(1)
@@ -1,28 +1,25 @@
 from manim import *
 import numpy as np
 
+from drawing import ArrowField, EpicycleSystem
+from epicycles import terms
+from particles import Emitter, ParticleCloud, ParticlePool
+
 
 class FourierCircles(Scene):
     """Beautiful Fourier series visualization with epicycles"""
     def construct(self):
-        # Create multiple rotating circles
-        circles = VGroup()
-        radii = [2, 1, 0.5, 0.25]
-        colors = [BLUE, GREEN, YELLOW, RED]
-
-        for i, (r, color) in enumerate(zip(radii, colors)):
-            circle = Circle(radius=r, color=color, stroke_width=2)
-            circles.add(circle)
+        # Four circles, each turning one more time per cycle than the one it rides on
+        coefficients, frequencies = terms([2, 1, 0.5, 0.25], [1, 2, 3, 4])
+        system = EpicycleSystem(coefficients, frequencies, colors=[BLUE, GREEN, YELLOW, RED])
 
-        self.play(
-            *[Create(c) for c in circles],
-            run_time=2
-        )
+        self.play(Create(system), run_time=2)
 
         # Rotate them with different speeds
-        self.play(
-            *[Rotate(circles[i], angle=2*PI*(i+1), run_time=4) for i in range(len(circles))],
-        )
+        t = ValueTracker(0)
+        system.add_updater(lambda m: m.set_time(t.get_value()))
+        self.play(t.animate.set_value(TAU), run_time=4)
+        system.clear_updaters()
 
         self.wait(0.5)
 
@@ -93,34 +90,46 @@ class FibonacciSpiral(Scene):
 
 class ParticleSystem(Scene):
     """Particle explosion effect"""
+    # The particles are stepped by dt updaters
+    replay_cached_segments = True
+
     def construct(self):
         # Create center point
         center = Dot(ORIGIN, color=WHITE, radius=0.1)
         self.add(center)
 
-        # Create particles
-        num_particles = 30
-        particles = VGroup()
+        # Up to 30,000 particles in fixed buffers, drawn as one point cloud
+        pool = ParticlePool(30000, gravity=(0, -1.5), drag=1.2)
+        explosion = Emitter(pool, speed=(2.0, 6.0), lifetime=(1.5, 2.5), colors=(BLUE, RED))
+        fountain = Emitter(
+            pool, rate=8000, direction=PI/2, spread=0.6, speed=(4.0, 7.0),
+            lifetime=(1.0, 2.0), colors=(YELLOW, ORANGE, RED), seed=1,
+        )
+        emitting = []
 
-        for i in range(num_particles):
-            angle = i * 2 * PI / num_particles
-            particle = Dot(ORIGIN, color=interpolate_color(BLUE, RED, i/num_particles), radius=0.08)
-            particles.add(particle)
+        def simulate(cloud, dt):
+            for emitter in emitting:
+                emitter.emit(dt)
+            pool.step(dt)
+            pool.draw(cloud)
 
-        self.play(FadeIn(particles), run_time=0.5)
+        particles = ParticleCloud(np.zeros((0, 2)), size=0.03)
+        particles.add_updater(simulate)
+        self.add(particles)
+        self.bring_to_front(center)
 
-        # Explode outward
-        animations = []
-        for i, particle in enumerate(particles):
-            angle = i * 2 * PI / num_particles
-            direction = np.array([np.cos(angle), np.sin(angle), 0])
-            target_pos = ORIGIN + direction * 3
-            animations.append(particle.animate.move_to(target_pos))
+        # Explode outward, drag slowing the particles as they spread
+        explosion.burst(20000)
+        self.wait(2)
 
-        self.play(*animations, run_time=2, rate_func=rush_from)
-        self.wait(0.5)
+        # Then a fountain of sparks for a few seconds, and let it die down
+        emitting.append(fountain)
+        self.wait(3)
+        emitting.clear()
+        self.wait(2)
 
         # Fade out
+        particles.clear_updaters()
         self.play(FadeOut(particles), FadeOut(center), run_time=1)
 
 
@@ -149,6 +158,21 @@ class GeometricTransformations(Scene):
 
 class VectorField(Scene):
     """Flowing vector field visualization"""
+    spacing = 0.7
+    length_scale = 1.0
+    thickness = 0.02
+    tip_length = 0.25
+    swirl_time = 0  # seconds spent turning the flow outwards at the end
+
+    def vector_func(self, pos, t=0.0):
+        """Circular flow for (..., 3) points, rotated by t towards an outward one"""
+        x, y = pos[..., 0], pos[..., 1]
+        return np.stack([
+            -y * np.cos(t) + x * np.sin(t),
+            x * np.cos(t) + y * np.sin(t),
+            np.zeros_like(x),
+        ], axis=-1) * 0.3
+
     def construct(self):
         # Create vector field
         plane = NumberPlane(
@@ -161,33 +185,42 @@ class VectorField(Scene):
             }
         )
 
-        # Define vector function (circular flow)
-        def vector_func(pos):
-            x, y = pos[0], pos[1]
-            return np.array([-y, x, 0]) * 0.3
-
-        # Create arrows
-        vectors = VGroup()
-        for x in np.arange(-3, 3.5, 0.7):
-            for y in np.arange(-3, 3.5, 0.7):
-                point = np.array([x, y, 0])
-                direction = vector_func(point)
-                if np.linalg.norm(direction) > 0:
-                    arrow = Arrow(
-                        point,
-                        point + direction,
-                        color=interpolate_color(BLUE, RED, np.linalg.norm(direction)),
-                        buff=0,
-                        stroke_width=2,
-                        max_tip_length_to_length_ratio=0.3
-                    )
-                    vectors.add(arrow)
+        # Create arrows, evaluated over the whole grid at once
+        values = np.arange(-3, 3.5, self.spacing)
+        vectors = ArrowField(
+            self.vector_func,
+            values,
+            values,
+            colors=(BLUE, RED),
+            min_magnitude=0,
+            length_scale=self.length_scale,
+            thickness=self.thickness,
+            tip_length=self.tip_length,
+            max_tip_ratio=0.3,
+        )
 
         self.play(Create(plane), run_time=1)
         self.play(Create(vectors), run_time=2, lag_ratio=0.01)
+
+        if self.swirl_time:
+            # Re-evaluate the field every frame as it turns
+            t = ValueTracker(0)
+            vectors.add_updater(lambda m: m.set_field(lambda pos: self.vector_func(pos, t.get_value())))
+            self.play(t.animate.set_value(PI / 2), run_time=self.swirl_time)
+            vectors.clear_updaters()
+
         self.wait(1)
 
 
+class VectorFieldDense(VectorField):
+    """100 x 100 arrows of a field that changes over time"""
+    spacing = 0.065
+    length_scale = 0.2
+    thickness = 0.006
+    tip_length = 0.03
+    swirl_time = 4
+
+
 class SineWavePulse(Scene):
     """Animated sine wave pulse"""
     def construct(self):
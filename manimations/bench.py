@@ -0,0 +1,252 @@
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from render import (
+    HERE, MEDIA_DIR, QUALITIES, discover_scenes, load_module, manim_version, scene_key, select_scenes,
+)
+
+RESULTS = MEDIA_DIR / "benchmarks" / "latest.json"
+BASELINE = HERE / "benchmarks" / "baseline.json"
+
+# A scene counts as slower when it takes this much longer than its baseline...
+THRESHOLD = 0.15
+# ...and the difference is above timer and scheduling noise
+MIN_SECONDS = 0.25
+
+
+def measure_scene(module_path, scene_name, quality):
+    """Render one scene into a scratch directory and record where time went
+
+    Meant to run in a fresh process: peak RSS is the high-water mark of the
+    process and, separately, of its largest child process (the Mandelbrot
+    pool workers). Caching is off so every segment is actually
+    drawn and encoded.
+    """
+    from manim import tempconfig
+    from mandelbrot import shutdown_pools
+
+    scene_class = getattr(load_module(module_path), scene_name)
+
+    with tempfile.TemporaryDirectory() as media_dir, tempconfig({
+        "quality": quality,
+        "media_dir": media_dir,
+        "input_file": str(module_path),
+        "progress_bar": "none",
+        "verbosity": "WARNING",
+        "disable_caching": True,
+        "preview": False,
+    }):
+        start = time.perf_counter()
+        scene = scene_class()
+        renderer = scene.renderer
+        file_writer = renderer.file_writer
+
+        plays = []
+        frames = 0
+        peak_mobjects = 0
+
+        def count_mobjects():
+            return sum(len(mobject.get_family()) for mobject in scene.mobjects)
+
+        # Every self.play and self.wait goes through renderer.play
+        renderer_play = renderer.play
+
+        def timed_play(*args, **kwargs):
+            nonlocal peak_mobjects
+            play_start = time.perf_counter()
+            renderer_play(*args, **kwargs)
+            plays.append(time.perf_counter() - play_start)
+            peak_mobjects = max(peak_mobjects, count_mobjects())
+
+        write_frame = file_writer.write_frame
+
+        def counted_write_frame(frame, num_frames=1):
+            nonlocal frames
+            frames += num_frames
+            write_frame(frame, num_frames)
+
+        construct = scene.construct
+        construct_seconds = 0.0
+
+        def timed_construct():
+            nonlocal construct_seconds
+            construct_start = time.perf_counter()
+            construct()
+            construct_seconds = time.perf_counter() - construct_start
+
+        renderer.play = timed_play
+        file_writer.write_frame = counted_write_frame
+        scene.construct = timed_construct
+
+        scene.render()
+        total = time.perf_counter() - start
+
+    # Reap the Mandelbrot workers so their peak memory is counted
+    shutdown_pools()
+
+    # ru_maxrss is in KiB on Linux but bytes on macOS
+    unit = 1 << 20 if sys.platform == "darwin" else 1 << 10
+    return {
+        "seconds": round(total, 3),
+        # Time in construct outside of play/wait: building mobjects and such
+        "build": round(construct_seconds - sum(plays), 3),
+        "plays": [round(seconds, 3) for seconds in plays],
+        "frames": frames,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unit, 1),
+        "peak_child_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / unit, 1),
+        "mobjects": max(peak_mobjects, count_mobjects()),
+    }
+
+
+def run_benchmarks(scenes, qualities, jobs=1):
+    """Measure every scene at every quality, one fresh process per scene
+
+    Yields (quality, scene key, measurements) in submission order; keys are
+    ``module:Scene``, since several modules reuse class names.
+    The default of one scene at a time keeps timings comparable; more jobs
+    finish sooner but make the scenes compete for the CPU.
+    """
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=1,
+    ) as pool:
+        futures = [
+            (quality, path, name, pool.submit(measure_scene, path, name, quality))
+            for quality in qualities
+            for path, name in scenes
+        ]
+        for quality, path, name, future in futures:
+            try:
+                yield quality, scene_key(path, name), {"module": path.name, **future.result()}
+            except Exception as error:
+                yield quality, scene_key(path, name), {"module": path.name, "error": str(error)}
+
+
+def compare(results, baseline, threshold=THRESHOLD, min_seconds=MIN_SECONDS):
+    """(quality, scene, seconds, baseline seconds) for every scene that got slower"""
+    regressions = []
+    for quality, scenes in results.items():
+        for key, result in scenes.items():
+            before = baseline.get(quality, {}).get(key, {}).get("seconds")
+            seconds = result.get("seconds")
+            if before is None or seconds is None:
+                continue
+            if seconds > before * (1 + threshold) and seconds - before > min_seconds:
+                regressions.append((quality, key, seconds, before))
+    return regressions
+
+
+def load_results(path):
+    if not Path(path).exists():
+        return {}
+    return json.loads(Path(path).read_text()).get("results", {})
+
+
+def save_results(path, results):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "manim": manim_version(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }, indent=2) + "\n")
+
+
+def print_table(results, baseline):
+    rows = [
+        (quality, key, result)
+        for quality, scenes in results.items()
+        for key, result in scenes.items()
+    ]
+    rows.sort(key=lambda row: row[2].get("seconds", float("inf")), reverse=True)
+
+    print(f"{'scene':<44} {'quality':<18} {'total':>8} {'build':>7} {'worst play':>10} "
+          f"{'frames':>7} {'fps':>6} {'rss MB':>7} {'child MB':>8} {'mobjects':>8} {'vs base':>8}")
+    for quality, key, result in rows:
+        if "error" in result:
+            print(f"{key:<44} {quality:<18} FAILED: {result['error']}")
+            continue
+
+        seconds = result["seconds"]
+        before = baseline.get(quality, {}).get(key, {}).get("seconds")
+        change = f"{(seconds / before - 1) * 100:+7.1f}%" if before else f"{'-':>8}"
+        print(
+            f"{key:<44} {quality:<18} {seconds:7.2f}s {result['build']:6.2f}s "
+            f"{max(result['plays'], default=0):9.2f}s {result['frames']:>7} "
+            f"{result['frames'] / seconds:6.1f} {result['peak_rss_mb']:>7.0f} "
+            f"{result['peak_child_rss_mb']:>8.0f} "
+            f"{result['mobjects']:>8} {change}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="manimations-bench",
+        description="Time every scene and compare against a stored baseline",
+    )
+    parser.add_argument("scenes", nargs="*",
+                        help="scene class names or module:Scene (default: all)")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, nargs="+", default=["l", "h"],
+                        help="manim quality flags (default: l h, i.e. 480p15 and 1080p60)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="scenes measured at once (default: 1)")
+    parser.add_argument("-o", "--output", type=Path, default=RESULTS,
+                        help=f"results file (default: {RESULTS.relative_to(HERE)})")
+    parser.add_argument("--baseline", type=Path, default=BASELINE,
+                        help=f"baseline file (default: {BASELINE.relative_to(HERE)})")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help=f"allowed slowdown as a fraction (default: {THRESHOLD})")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="write these results to the baseline file")
+    args = parser.parse_args(argv)
+
+    scenes = select_scenes(discover_scenes(), args.scenes)
+    qualities = [QUALITIES[flag] for flag in args.quality]
+
+    results = {quality: {} for quality in qualities}
+    for quality, key, result in run_benchmarks(scenes, qualities, args.jobs):
+        results[quality][key] = result
+        status = f"FAILED: {result['error']}" if "error" in result else f"{result['seconds']:.2f}s"
+        print(f"{key:<44} {quality:<18} {status}", flush=True)
+
+    save_results(args.output, results)
+    baseline = load_results(args.baseline)
+
+    print()
+    print_table(results, baseline)
+
+    if args.update_baseline:
+        # Keep entries for scenes and qualities that weren't part of this run
+        merged = baseline
+        for quality, scenes in results.items():
+            merged.setdefault(quality, {}).update(
+                (key, result) for key, result in scenes.items() if "error" not in result
+            )
+        save_results(args.baseline, merged)
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} scene(s) slower than baseline by more than {args.threshold:.0%}:")
+        for quality, key, seconds, before in regressions:
+            print(f"  {key:<44} {quality:<18} {before:.2f}s -> {seconds:.2f}s")
+        sys.exit(1)
+    if any("error" in result for scenes in results.values() for result in scenes.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
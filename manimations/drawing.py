@@ -0,0 +1,393 @@
+from manim import *
+import numpy as np
+
+from dynamics import pendulum_points, sample
+from epicycles import centers, to_points
+
+
+def path_points(mobject, samples_per_curve=16):
+    """Points along every curve of a VMobject (an SVGMobject, Text, a shape), in drawing order
+
+    Separate subpaths are simply joined one after another, so feed
+    ``epicycles.fourier_coefficients`` single-outline shapes for clean results.
+    """
+    s = np.linspace(0, 1, samples_per_curve, endpoint=False)[:, None, None]
+    chunks = []
+    for part in mobject.family_members_with_points():
+        curves = part.points.reshape(-1, part.n_points_per_cubic_curve, 3)
+        a, b, c, d = (curves[:, k] for k in range(4))
+        points = (1 - s) ** 3 * a + 3 * (1 - s) ** 2 * s * b + 3 * (1 - s) * s ** 2 * c + s ** 3 * d
+        chunks.append(points.transpose(1, 0, 2).reshape(-1, 3))
+    return np.concatenate(chunks)
+
+
+class EpicycleSystem(VGroup):
+    """Chain of rotating circles, each riding on the rim of the one before
+
+    Built from ``coefficients`` and ``frequencies`` as returned by the
+    ``epicycles`` module and positioned at time t with ``set_time``. All
+    centers come from one cumulative sum and the circles of each color are
+    one VMobject, so a frame costs the same few array operations for 5
+    terms or 500. ``colors`` are cycled over the circles; constant terms
+    have no circle and just move the chain's ``origin``.
+    """
+    def __init__(
+        self,
+        coefficients,
+        frequencies,
+        origin=ORIGIN,
+        colors=(BLUE,),
+        circle_width=2,
+        circle_opacity=1.0,
+        arm_color=GREY,
+        arm_width=1.5,
+        arm_opacity=0.5,
+        tip_color=WHITE,
+        tip_radius=0.06,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        coefficients = np.asarray(coefficients, dtype=np.complex128)
+        frequencies = np.asarray(frequencies)
+
+        constant = frequencies == 0
+        self.origin = np.asarray(origin, dtype=np.float64) + to_points(coefficients[constant].sum())
+        self.coefficients = coefficients[~constant]
+        self.frequencies = frequencies[~constant]
+        self.radii = np.abs(self.coefficients)
+        self.time = 0.0
+
+        # Bezier points of a unit circle, scaled and moved into place per term
+        self.unit_circle = Circle(radius=1).points
+        index = np.arange(len(self.radii)) % len(colors)
+        self.color_terms = [np.flatnonzero(index == k) for k in range(len(colors))]
+
+        self.circles = VGroup(*[
+            VMobject(stroke_color=color, stroke_width=circle_width, stroke_opacity=circle_opacity)
+            for color in colors
+        ])
+        self.arms = VMobject(stroke_color=arm_color, stroke_width=arm_width, stroke_opacity=arm_opacity)
+        self.tip = Dot(color=tip_color, radius=tip_radius)
+        self.add(self.circles, self.arms, self.tip)
+        self.set_time(0)
+
+    def get_centers(self, t=None):
+        """(terms + 1, 3) circle centers, the drawn point last"""
+        t = self.time if t is None else t
+        return to_points(centers(self.coefficients, self.frequencies, t)) + self.origin
+
+    def get_tip(self):
+        return self.tip.get_center()
+
+    def set_time(self, t):
+        self.time = t
+        points = self.get_centers(t)
+
+        for circle, terms in zip(self.circles, self.color_terms):
+            circle.set_points(
+                (self.unit_circle * self.radii[terms, None, None] + points[terms, None]).reshape(-1, 3)
+            )
+        self.arms.set_points_as_corners(points)
+        self.tip.move_to(points[-1])
+        return self
+
+
+class PendulumFan(VGroup):
+    """Many double pendulums hanging from one pivot, drawn as a few VMobjects
+
+    Pendulum i takes its color from the ``colors`` gradient, and the arms
+    and bobs of each of the ``color_bins`` colors are one VMobject apiece.
+    ``set_joints`` places every pendulum from one (N, 2, 3) array of joint
+    and bob positions, as returned by ``dynamics.pendulum_points``.
+    """
+    def __init__(
+        self,
+        origin,
+        count,
+        colors=(BLUE, RED),
+        color_bins=16,
+        arm_width=1.5,
+        arm_opacity=0.35,
+        bob_radius=0.03,
+        bob_opacity=0.8,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.origin = np.asarray(origin, dtype=np.float64)
+        self.handles = np.linspace(0, 1, self.n_points_per_cubic_curve)[None, None, :, None]
+        # Bezier points of one bob around the origin, moved into place per pendulum
+        self.unit_circle = Circle(radius=bob_radius).points
+
+        bins = np.minimum(np.arange(count) * color_bins // count, color_bins - 1)
+        self.bin_pendulums = [np.flatnonzero(bins == k) for k in range(color_bins)]
+        bin_colors = color_gradient(colors, color_bins)
+
+        self.arms = VGroup(*[
+            VMobject(stroke_color=color, stroke_width=arm_width, stroke_opacity=arm_opacity)
+            for color in bin_colors
+        ])
+        self.bobs = VGroup(*[
+            VMobject(fill_color=color, fill_opacity=bob_opacity, stroke_width=0)
+            for color in bin_colors
+        ])
+        self.add(self.arms, self.bobs)
+
+    def set_joints(self, joints):
+        joints = np.asarray(joints, dtype=np.float64)
+        # Pivot, joint, bob of every pendulum; its two arms as straight cubic curves
+        corners = np.concatenate([np.broadcast_to(self.origin, joints[:, :1].shape), joints], axis=1)
+        starts, ends = corners[:, :-1, None], corners[:, 1:, None]
+        curves = starts + (ends - starts) * self.handles
+
+        for arms, bobs, pendulums in zip(self.arms, self.bobs, self.bin_pendulums):
+            arms.set_points(curves[pendulums].reshape(-1, 3))
+            bobs.set_points((self.unit_circle + joints[pendulums, 1, None]).reshape(-1, 3))
+        return self
+
+
+class DoublePendulums(VGroup):
+    """A few double pendulums on one pivot, each with two rods, a bob and a trail
+
+    ``angles`` (T, N, 2) are sampled every ``dt``, as returned by
+    ``dynamics.release_double_pendulums``. ``set_time`` moves every pendulum
+    to where it is at time t, between samples if need be, and reveals each
+    bob's precomputed path up to then as its trail.
+    """
+    def __init__(
+        self,
+        angles,
+        dt,
+        origin,
+        L1,
+        L2,
+        colors,
+        rod_opacity=0.5,
+        bob_radius=0.12,
+        trail_width=2,
+        trail_opacity=0.7,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.angles = np.asarray(angles)
+        self.dt = dt
+        self.origin = np.asarray(origin, dtype=np.float64)
+        self.lengths = (L1, L2)
+
+        self.systems = VGroup(*[
+            VGroup(
+                Line(self.origin, self.origin + DOWN, color=WHITE, stroke_width=2, stroke_opacity=rod_opacity),
+                Line(self.origin + DOWN, self.origin + 2 * DOWN, color=WHITE, stroke_width=2, stroke_opacity=rod_opacity),
+                Dot(color=color, radius=bob_radius),
+            )
+            for color in colors
+        ])
+        bobs = pendulum_points(self.angles, self.origin, L1, L2)[..., 1, :]
+        self.trails = VGroup(*[
+            RevealedPath(bobs[:, index], dt, stroke_color=color, stroke_width=trail_width, stroke_opacity=trail_opacity)
+            for index, color in enumerate(colors)
+        ])
+        self.add(self.systems, self.trails)
+        self.set_time(0)
+
+    def set_time(self, t):
+        frame = pendulum_points(sample(self.angles, t, self.dt), self.origin, *self.lengths)
+        for system, (p1, p2) in zip(self.systems, frame):
+            system[0].put_start_and_end_on(self.origin, p1)
+            system[1].put_start_and_end_on(p1, p2)
+            system[2].move_to(p2)
+        for trail in self.trails:
+            trail.set_time(t)
+        return self
+
+
+class TracedCurve(VMobject):
+    """Polyline grown corner by corner in amortized constant time
+
+    Segments are stored as straight cubic curves in a buffer that doubles
+    when full, and ``points`` is a view of the part in use, so appending
+    never copies the whole path. With ``max_points`` only the newest
+    segments are kept, as a trail: the buffer holds twice as many and
+    slides the window back to its start when it fills up. ``fade_bands``
+    splits the curve into that many pieces of rising opacity, oldest first.
+    """
+    def __init__(self, start=ORIGIN, max_points=None, fade_bands=1, capacity=256, **kwargs):
+        super().__init__(**kwargs)
+        self.max_points = max_points
+        if max_points is not None:
+            capacity = 2 * max_points
+        self.curves = np.zeros((capacity, self.n_points_per_cubic_curve, 3))
+        # Curves in use are curves[first:count]
+        self.first = self.count = 0
+        self.end = np.asarray(start, dtype=np.float64)
+        self.handles = np.linspace(0, 1, self.n_points_per_cubic_curve)[None, :, None]
+
+        opacity = self.get_stroke_opacity()
+        self.add(*[
+            VMobject(
+                stroke_color=self.get_stroke_color(),
+                stroke_width=self.get_stroke_width(),
+                stroke_opacity=opacity * k / fade_bands,
+            )
+            for k in range(1, fade_bands)
+        ])
+        self.bands = [*self.submobjects, self]
+        self.refresh()
+
+    def add_points_as_corners(self, points):
+        """Straight segments from the current end through each of ``points``"""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        starts = np.concatenate([self.end[None], points[:-1]])
+        self.end = points[-1]
+
+        new = starts[:, None] + (points - starts)[:, None] * self.handles
+        if self.max_points is not None:
+            new = new[-self.max_points:]
+        self.reserve(len(new))
+
+        self.curves[self.count:self.count + len(new)] = new
+        self.count += len(new)
+        if self.max_points is not None:
+            self.first = max(self.first, self.count - self.max_points)
+        return self.refresh()
+
+    def reserve(self, n):
+        """Make room for n more curves"""
+        if self.count + n <= len(self.curves):
+            return
+        if self.max_points is None:
+            curves = np.zeros((max(2 * len(self.curves), self.count + n),) + self.curves.shape[1:])
+            curves[:self.count] = self.curves[:self.count]
+            self.curves = curves
+        else:
+            # Only the curves that stay in the window are moved
+            keep = max(self.max_points - n, 0)
+            self.curves[:keep] = self.curves[self.count - keep:self.count]
+            self.first, self.count = 0, keep
+
+    def refresh(self):
+        edges = np.linspace(self.first, self.count, len(self.bands) + 1).round().astype(int)
+        for band, start, stop in zip(self.bands, edges[:-1], edges[1:]):
+            band.points = self.curves[start:stop].reshape(-1, 3)
+        return self
+
+
+class RevealedPath(TracedCurve):
+    """Known path drawn up to a point in time, for precomputed trajectories
+
+    ``points`` (T, 3) are the positions at times 0, dt, 2 dt... All segments
+    are built once; ``set_time`` shows those up to t, ending partway along
+    the current one, by slicing them, where a TracedPath would sample a
+    mobject every frame and keep growing. ``max_points`` and ``fade_bands``
+    turn it into a fading trail as for TracedCurve.
+    """
+    def __init__(self, points, dt=1.0, max_points=None, fade_bands=1, **kwargs):
+        points = np.asarray(points, dtype=np.float64)
+        super().__init__(points[0], max_points=max_points, fade_bands=fade_bands, **kwargs)
+        self.dt = dt
+        self.samples = points
+
+        starts, ends = points[:-1], points[1:]
+        self.segments = starts[:, None] + (ends - starts)[:, None] * self.handles
+        self.curves = self.segments.copy()
+        # Index of the curve cut short to end between samples, if any
+        self.partial = None
+        self.set_time(0)
+
+    def set_time(self, t):
+        position = np.clip(t / self.dt, 0, len(self.segments))
+        k = int(position)
+        fraction = position - k
+
+        if self.partial is not None:
+            self.curves[self.partial] = self.segments[self.partial]
+            self.partial = None
+        if fraction > 0:
+            start = self.samples[k]
+            end = start + (self.samples[k + 1] - start) * fraction
+            self.curves[k] = start + (end - start) * self.handles[0]
+            self.partial = k
+            k += 1
+
+        self.count = k
+        if self.max_points is not None:
+            self.first = max(k - self.max_points, 0)
+        return self.refresh()
+
+
+class ArrowField(VGroup):
+    """Arrows of a whole vector field, drawn as a few filled VMobjects
+
+    ``func`` maps an (N, 3) array of points to (N, 3) vectors and is called
+    once for the grid of ``x_values`` by ``y_values``. Each arrow starts at
+    its grid point; magnitudes are colored through ``colors`` across
+    ``magnitude_range``, and the arrow outlines are split into
+    ``color_bins`` VMobjects by color. ``set_field`` rebuilds everything
+    from a new function, cheaply enough to call every frame.
+    """
+    def __init__(
+        self,
+        func,
+        x_values,
+        y_values,
+        colors=(BLUE, RED),
+        magnitude_range=(0, 1),
+        min_magnitude=0.01,
+        length_scale=1.0,
+        thickness=0.02,
+        tip_length=0.25,
+        max_tip_ratio=0.35,
+        color_bins=16,
+        opacity=1.0,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        x, y = np.meshgrid(x_values, y_values, indexing="ij")
+        self.grid = np.stack([x.ravel(), y.ravel(), np.zeros(x.size)], axis=1)
+        self.magnitude_range = magnitude_range
+        self.min_magnitude = min_magnitude
+        self.length_scale = length_scale
+        self.thickness = thickness
+        self.tip_length = tip_length
+        self.max_tip_ratio = max_tip_ratio
+        self.handles = np.linspace(0, 1, self.n_points_per_cubic_curve)[:, None]
+
+        stops = np.linspace(0, 1, len(colors))
+        rgbs = np.array([ManimColor(color).to_rgb() for color in colors])
+        for value in (np.arange(color_bins) + 0.5) / color_bins:
+            rgb = [np.interp(value, stops, rgbs[:, k]) for k in range(3)]
+            self.add(VMobject(fill_color=ManimColor.from_rgb(rgb), fill_opacity=opacity, stroke_width=0))
+        self.set_field(func)
+
+    def outlines(self, starts, vectors):
+        """(N, 8, 3) corners around each arrow, the first repeated at the end"""
+        length = np.linalg.norm(vectors[:, :2], axis=1)
+        along = vectors[:, :2] / length[:, None]
+        across = np.stack([-along[:, 1], along[:, 0]], axis=1)
+
+        head = np.minimum(self.tip_length, self.max_tip_ratio * length)
+        neck = length - head
+        shaft = np.minimum(self.thickness, head / 2) / 2
+        zero = np.zeros_like(length)
+        a = np.stack([zero, neck, neck, length, neck, neck, zero, zero], axis=1)
+        b = np.stack([shaft, shaft, head / 2, zero, -head / 2, -shaft, -shaft, shaft], axis=1)
+
+        corners = np.repeat(starts[:, None], 8, axis=1)
+        corners[..., :2] += a[..., None] * along[:, None] + b[..., None] * across[:, None]
+        return corners
+
+    def set_field(self, func):
+        self.vectors = np.asarray(func(self.grid), dtype=np.float64)
+        magnitude = np.linalg.norm(self.vectors, axis=1)
+        low, high = self.magnitude_range
+        bins = np.clip(((magnitude - low) / (high - low) * len(self)).astype(int), 0, len(self) - 1)
+
+        shown = magnitude > self.min_magnitude
+        corners = self.outlines(self.grid[shown], self.vectors[shown] * self.length_scale)
+        # Every edge of every outline as a straight cubic curve
+        starts, ends = corners[:, :-1, None], corners[:, 1:, None]
+        curves = starts + (ends - starts) * self.handles
+
+        bins = bins[shown]
+        for k, arrows in enumerate(self):
+            arrows.set_points(curves[bins == k].reshape(-1, 3))
+        return self
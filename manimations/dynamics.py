@@ -0,0 +1,232 @@
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+# Simulations are stored here as .npy files and memory-mapped on reuse
+CACHE_DIR = Path(os.environ.get(
+    "SIMULATION_CACHE", Path(__file__).resolve().parent / "media" / "simulation_cache"
+))
+
+
+def lorenz(state, sigma=10.0, rho=28.0, beta=8 / 3):
+    """Lorenz system derivative for a batch of states shaped (..., 3)"""
+    x, y, z = state[..., 0], state[..., 1], state[..., 2]
+
+    derivative = np.empty_like(state)
+    derivative[..., 0] = sigma * (y - x)
+    derivative[..., 1] = x * (rho - z) - y
+    derivative[..., 2] = x * y - beta * z
+    return derivative
+
+
+def rk4_step(f, state, dt, **params):
+    """One classical Runge-Kutta step of every state in the batch at once"""
+    k1 = f(state, **params)
+    k2 = f(state + 0.5 * dt * k1, **params)
+    k3 = f(state + 0.5 * dt * k2, **params)
+    k4 = f(state + dt * k3, **params)
+    return state + dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+
+def integrate(f, initial, dt, steps, out=None, **params):
+    """Trajectories of a batch of initial states under ds/dt = f(s)
+
+    ``initial`` is shaped (N, d); the result is a (steps, N, d) array whose
+    row k is the state after k + 1 steps. Pass ``out`` to fill an existing
+    buffer (a memory-mapped file, for instance) instead of allocating one.
+    """
+    state = np.array(initial, dtype=np.float64)
+    if out is None:
+        out = np.empty((steps,) + state.shape)
+
+    for k in range(steps):
+        state = rk4_step(f, state, dt, **params)
+        out[k] = state
+    return out
+
+
+def double_pendulum(state, L1=1.0, L2=1.0, m1=1.0, m2=1.0, g=9.8):
+    """Hamilton's equations of a double pendulum, for a batch of states (..., 4)
+
+    States are canonical: (theta1, theta2, p1, p2), angles from the downward
+    vertical and their conjugate momenta. A pendulum released from rest has
+    p1 = p2 = 0.
+    """
+    theta1, theta2, p1, p2 = (state[..., k] for k in range(4))
+    delta = theta1 - theta2
+    cos, sin = np.cos(delta), np.sin(delta)
+    d = m1 + m2 * sin ** 2
+
+    c1 = p1 * p2 * sin / (L1 * L2 * d)
+    c2 = (
+        (m2 * L2 ** 2 * p1 ** 2 + (m1 + m2) * L1 ** 2 * p2 ** 2 - 2 * m2 * L1 * L2 * p1 * p2 * cos)
+        * np.sin(2 * delta) / (2 * L1 ** 2 * L2 ** 2 * d ** 2)
+    )
+
+    derivative = np.empty_like(state)
+    derivative[..., 0] = (L2 * p1 - L1 * p2 * cos) / (L1 ** 2 * L2 * d)
+    derivative[..., 1] = (L1 * (m1 + m2) * p2 - L2 * m2 * p1 * cos) / (L1 * L2 ** 2 * m2 * d)
+    derivative[..., 2] = -(m1 + m2) * g * L1 * np.sin(theta1) - c1 + c2
+    derivative[..., 3] = -m2 * g * L2 * np.sin(theta2) + c1 - c2
+    return derivative
+
+
+def double_pendulum_energy(state, L1=1.0, L2=1.0, m1=1.0, m2=1.0, g=9.8):
+    """Total energy (the Hamiltonian) of states shaped (..., 4)"""
+    theta1, theta2, p1, p2 = (state[..., k] for k in range(4))
+    delta = theta1 - theta2
+    kinetic = (
+        (m2 * L2 ** 2 * p1 ** 2 + (m1 + m2) * L1 ** 2 * p2 ** 2 - 2 * m2 * L1 * L2 * p1 * p2 * np.cos(delta))
+        / (2 * m2 * L1 ** 2 * L2 ** 2 * (m1 + m2 * np.sin(delta) ** 2))
+    )
+    potential = -(m1 + m2) * g * L1 * np.cos(theta1) - m2 * g * L2 * np.cos(theta2)
+    return kinetic + potential
+
+
+def implicit_midpoint_step(f, state, dt, tolerance=1e-12, max_iterations=20, **params):
+    """One implicit midpoint step, solved by fixed-point iteration
+
+    The method is symplectic, so for a Hamiltonian in canonical coordinates
+    the energy error stays bounded instead of drifting over long runs.
+    """
+    new = state + dt * f(state, **params)
+    for _ in range(max_iterations):
+        next_new = state + dt * f(0.5 * (state + new), **params)
+        converged = np.max(np.abs(next_new - new)) < tolerance
+        new = next_new
+        if converged:
+            break
+    return new
+
+
+def double_pendulums(initial, dt, steps, substeps=10, out=None, **params):
+    """Batch of double pendulums sampled every ``dt``
+
+    Each sample is ``substeps`` implicit midpoint steps of dt / substeps,
+    so the physics step is independent of the frame rate. ``initial`` is
+    shaped (N, 4) like ``double_pendulum`` states; returns the (steps, N, 4)
+    states after each dt.
+    """
+    state = np.array(initial, dtype=np.float64)
+    if out is None:
+        out = np.empty((steps,) + state.shape)
+
+    h = dt / substeps
+    for k in range(steps):
+        for _ in range(substeps):
+            state = implicit_midpoint_step(double_pendulum, state, h, **params)
+        out[k] = state
+    return out
+
+
+def energy_drift(energy):
+    """Largest change of each run's energy from its start, for (steps, N) energies
+
+    Relative to the size of the starting energy, or to 1 where that is ~0.
+    """
+    start = energy[0]
+    return np.max(np.abs(energy - start), axis=0) / np.maximum(np.abs(start), 1.0)
+
+
+def sample(samples, t, dt):
+    """Value at time t of evenly spaced samples (samples[k] is at k * dt)
+
+    Linear interpolation between neighbors, clamped to the sampled range,
+    so a simulation can be played back at any frame rate.
+    """
+    position = np.clip(t / dt, 0, len(samples) - 1)
+    k = min(int(position), len(samples) - 2)
+    fraction = position - k
+    return samples[k] * (1 - fraction) + samples[k + 1] * fraction
+
+
+def release_double_pendulums(initial, dt, steps, substeps=10, **params):
+    """Swing double pendulums from (N, 4) initial states, cached on disk
+
+    Returns (angles, drift): (steps + 1, N, 2) angles, sample 0 at the
+    release and then one every dt, ready for ``sample``, and the largest
+    relative energy drift of any pendulum.
+    """
+    initial = np.asarray(initial, dtype=np.float64)
+    states = simulate(double_pendulums, initial, dt, steps, substeps=substeps, **params)
+    drift = energy_drift(double_pendulum_energy(states, **params)).max()
+    return np.concatenate([initial[None, :, :2], states[..., :2]]), drift
+
+
+def pendulum_points(angles, origin, L1, L2):
+    """Joint and bob positions (..., 2, 3) for (theta1, theta2) angles (..., 2)"""
+    theta1, theta2 = angles[..., 0], angles[..., 1]
+    points = np.zeros(angles.shape[:-1] + (2, 3))
+    points[..., 0, 0] = L1 * np.sin(theta1)
+    points[..., 0, 1] = -L1 * np.cos(theta1)
+    points[..., 1, 0] = points[..., 0, 0] + L2 * np.sin(theta2)
+    points[..., 1, 1] = points[..., 0, 1] - L2 * np.cos(theta2)
+    return points + origin
+
+
+def _cache_key(value):
+    if isinstance(value, np.ndarray):
+        return {"dtype": str(value.dtype), "shape": value.shape, "data": value.tolist()}
+    if callable(value):
+        # Code changes must invalidate what the old code computed, including
+        # changes to the helpers it calls: hash its whole module
+        module = inspect.getmodule(value)
+        return {"name": value.__qualname__, "module": inspect.getsource(module)}
+    return repr(value)
+
+
+def cached(name, shape, fill, **key):
+    """Array computed once by ``fill(out)`` and then loaded from disk
+
+    The result is stored as ``CACHE_DIR/<name>-<hash>.npy``, hashed from
+    ``key`` (parameters, initial conditions, step size and count, and the
+    functions involved, by the source of the modules defining them), and
+    returned as a read-only memory map,
+    so a cached simulation costs nothing to load on later renders.
+    """
+    digest = hashlib.sha256(json.dumps(
+        {k: _cache_key(v) for k, v in sorted(key.items())}, sort_keys=True
+    ).encode()).hexdigest()
+    path = CACHE_DIR / f"{name}-{digest[:16]}.npy"
+
+    if not path.exists():
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write under a private name so concurrent renders never see a partial file
+        partial = path.with_suffix(f".{os.getpid()}.npy")
+        try:
+            out = np.lib.format.open_memmap(partial, mode="w+", dtype=np.float64, shape=shape)
+            fill(out)
+            out.flush()
+            del out
+            os.replace(partial, path)
+        finally:
+            partial.unlink(missing_ok=True)
+
+    return np.load(path, mmap_mode="r")
+
+
+def simulate(simulator, initial, dt, steps, **params):
+    """``simulator(initial, dt, steps, out=..., **params)``, cached on disk"""
+    initial = np.asarray(initial, dtype=np.float64)
+    return cached(
+        simulator.__name__,
+        (steps,) + initial.shape,
+        lambda out: simulator(initial, dt, steps, out=out, **params),
+        simulator=simulator, initial=initial, dt=dt, steps=steps, **params,
+    )
+
+
+def trajectory(f, initial, dt, steps, **params):
+    """``integrate``, cached on disk by ``cached``"""
+    initial = np.asarray(initial, dtype=np.float64)
+    return cached(
+        f.__name__,
+        (steps,) + initial.shape,
+        lambda out: integrate(f, initial, dt, steps, out=out, **params),
+        f=f, step=rk4_step, integrator=integrate,
+        initial=initial, dt=dt, steps=steps, **params,
+    )
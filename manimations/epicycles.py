@@ -0,0 +1,73 @@
+import numpy as np
+
+
+def to_complex(points):
+    """Complex numbers x + iy from (N, 2) or (N, 3) points; complex input is passed through"""
+    points = np.asarray(points)
+    if np.iscomplexobj(points):
+        return points
+    return points[..., 0] + 1j * points[..., 1]
+
+
+def to_points(z):
+    """(..., 3) scene points at z = 0 from complex numbers"""
+    z = np.asarray(z)
+    points = np.zeros(z.shape + (3,))
+    points[..., 0] = z.real
+    points[..., 1] = z.imag
+    return points
+
+
+def resample(points, count):
+    """``count`` points evenly spaced by arc length around a closed polyline"""
+    z = to_complex(points)
+    closed = np.append(z, z[0])
+    distance = np.concatenate([[0], np.cumsum(np.abs(np.diff(closed)))])
+
+    targets = np.linspace(0, distance[-1], count, endpoint=False)
+    return np.interp(targets, distance, closed.real) + 1j * np.interp(targets, distance, closed.imag)
+
+
+def terms(radii, frequencies, phases=0.0):
+    """(coefficients, frequencies) of hand-picked circles: radius, turns per unit of t, start angle"""
+    coefficients = np.asarray(radii, dtype=np.float64) * np.exp(1j * np.asarray(phases, dtype=np.float64))
+    return coefficients, np.asarray(frequencies, dtype=np.int64)
+
+
+def fourier_coefficients(points, count=100, samples=2048):
+    """Epicycles that trace a closed path, as (coefficients, frequencies)
+
+    ``points`` go once around the path, as scene points or complex numbers.
+    They are resampled evenly by arc length and transformed with one FFT;
+    the ``count`` largest terms are kept, the constant one (the centroid)
+    first and the others by decreasing radius. The path is traced once as
+    t goes from 0 to 2 pi.
+    """
+    z = resample(points, max(samples, count))
+    coefficients = np.fft.fft(z) / len(z)
+    frequencies = np.fft.fftfreq(len(z), 1 / len(z)).round().astype(np.int64)
+
+    # The last key sorts first: the constant term, then largest radius
+    order = np.lexsort((-np.abs(coefficients), frequencies != 0))[:count]
+    return coefficients[order], frequencies[order]
+
+
+def centers(coefficients, frequencies, t):
+    """Circle centers at time t as complex numbers, shaped (..., terms + 1)
+
+    Entry k is the sum of the first k rotating terms, so entry 0 is 0 and
+    the last one is the point being drawn. ``t`` may be an array, to
+    evaluate many frames in one call.
+    """
+    t = np.asarray(t, dtype=np.float64)[..., None]
+    arms = coefficients * np.exp(1j * frequencies * t)
+
+    out = np.zeros(arms.shape[:-1] + (arms.shape[-1] + 1,), dtype=np.complex128)
+    np.cumsum(arms, axis=-1, out=out[..., 1:])
+    return out
+
+
+def trace(coefficients, frequencies, t):
+    """Point drawn at time t (or at every time in an array), as complex numbers"""
+    t = np.asarray(t, dtype=np.float64)[..., None]
+    return (coefficients * np.exp(1j * frequencies * t)).sum(axis=-1)
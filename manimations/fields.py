@@ -0,0 +1,121 @@
+import numpy as np
+
+from dynamics import rk4_step
+
+
+def inside(points, x_range, y_range):
+    """Mask of the (N, 3) points within the rectangle"""
+    x, y = points[:, 0], points[:, 1]
+    return (x >= x_range[0]) & (x <= x_range[1]) & (y >= y_range[0]) & (y <= y_range[1])
+
+
+class Advection:
+    """Particles carried by a steady vector field, integrated together with RK4
+
+    ``func`` maps (N, 3) points to (N, 3) velocities, like the vector
+    functions of the field scenes, and is scaled by ``speed``. Particles
+    that leave the ``x_range`` by ``y_range`` domain or outlive their
+    lifetime are respawned at random points inside it, so the flow stays
+    evenly covered; they fade in and out over ``fade`` seconds.
+    """
+    def __init__(self, func, count, x_range, y_range, speed=1.0, lifetime=(2.0, 4.0),
+                 fade=0.5, substeps=1, seed=0):
+        self.func = func
+        self.x_range = x_range
+        self.y_range = y_range
+        self.speed = speed
+        self.lifetime_range = lifetime
+        self.fade = fade
+        self.substeps = substeps
+        self.rng = np.random.default_rng(seed)
+
+        self.position = np.zeros((count, 3))
+        self.age = np.zeros(count)
+        self.lifetime = np.ones(count)
+        self.respawn(np.ones(count, dtype=bool))
+        # Start at staggered ages so they don't all respawn at once
+        self.age = self.rng.uniform(0, self.lifetime)
+
+    def velocity(self, points):
+        return self.speed * np.asarray(self.func(points), dtype=np.float64)
+
+    def respawn(self, mask):
+        count = np.count_nonzero(mask)
+        self.position[mask, 0] = self.rng.uniform(*self.x_range, count)
+        self.position[mask, 1] = self.rng.uniform(*self.y_range, count)
+        self.age[mask] = 0
+        self.lifetime[mask] = self.rng.uniform(*self.lifetime_range, count)
+
+    def step(self, dt):
+        h = dt / self.substeps
+        for _ in range(self.substeps):
+            self.position = rk4_step(self.velocity, self.position, h)
+        self.age += dt
+        self.respawn(~inside(self.position, self.x_range, self.y_range) | (self.age >= self.lifetime))
+
+    def opacities(self):
+        return np.clip(np.minimum(self.age, self.lifetime - self.age) / self.fade, 0, 1)
+
+    def draw(self, particles):
+        """Show the particles on a ParticleCloud or ParticleDots"""
+        return particles.set_particles(self.position, opacities=self.opacities())
+
+
+def streamlines(func, x_range, y_range, separation=0.5, step=0.05, max_steps=500, min_speed=1e-3):
+    """Evenly spaced streamlines of a steady field, as a list of (K, 3) point arrays
+
+    Seeds are tried on a grid ``separation`` apart. Each line follows the
+    field's direction both ways in RK4 steps of length ``step`` and stops at
+    the domain edge, where the flow stalls, when it closes on itself, or
+    when it comes within half a separation of a line already drawn.
+    """
+    def direction(point):
+        velocity = np.asarray(func(point), dtype=np.float64)
+        speed = np.linalg.norm(velocity)
+        return velocity / speed if speed > min_speed else np.zeros(3)
+
+    # Points of the lines drawn so far, bucketed by cells a separation wide
+    cells = {}
+
+    def cell_of(point):
+        return int(np.floor(point[0] / separation)), int(np.floor(point[1] / separation))
+
+    def crowded(point, distance):
+        i, j = cell_of(point)
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                nearby = cells.get((i + di, j + dj))
+                if nearby and np.min(np.linalg.norm(np.array(nearby) - point, axis=1)) < distance:
+                    return True
+        return False
+
+    def follow(seed, sign):
+        """Points from the seed on, and whether the line closed into a loop"""
+        points = [seed]
+        point = seed
+        for _ in range(max_steps):
+            if not direction(point).any():
+                break
+            point = rk4_step(lambda p: sign * direction(p), point, step)
+            if len(points) * step > 2 * separation and np.linalg.norm(point - seed) < step:
+                return points + [seed], True
+            if not inside(point[None], x_range, y_range)[0] or crowded(point, separation / 2):
+                break
+            points.append(point)
+        return points, False
+
+    lines = []
+    for x in np.arange(x_range[0] + separation / 2, x_range[1], separation):
+        for y in np.arange(y_range[0] + separation / 2, y_range[1], separation):
+            seed = np.array([x, y, 0.0])
+            if crowded(seed, separation):
+                continue
+            forward, closed = follow(seed, 1)
+            backward = [] if closed else follow(seed, -1)[0][:0:-1]
+            line = np.array(backward + forward)
+            if len(line) * step < separation:
+                continue
+            lines.append(line)
+            for point in line:
+                cells.setdefault(cell_of(point), []).append(point)
+    return lines
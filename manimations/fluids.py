@@ -0,0 +1,129 @@
+import numpy as np
+
+
+class StableFluid:
+    """Jos Stam's stable fluids on a periodic grid, solved with FFTs
+
+    Velocities are sampled at the grid points of a ``size`` rectangle
+    (scene units, origin at its lower left corner) divided into ``shape``
+    cells. Advection is semi-Lagrangian; viscosity and the projection onto
+    divergence-free fields are exact in Fourier space, so any time step is
+    stable.
+    """
+    def __init__(self, shape=(128, 72), size=(14.4, 8.1), viscosity=1e-3):
+        self.shape = tuple(shape)
+        self.size = np.asarray(size, dtype=np.float64)
+        self.cell = self.size / self.shape
+        self.viscosity = viscosity
+
+        nx, ny = self.shape
+        self.x, self.y = np.meshgrid(
+            np.arange(nx) * self.cell[0], np.arange(ny) * self.cell[1], indexing="ij"
+        )
+        self.u = np.zeros(self.shape)
+        self.v = np.zeros(self.shape)
+
+        self.kx, self.ky = np.meshgrid(
+            2 * np.pi * np.fft.fftfreq(nx, self.cell[0]),
+            2 * np.pi * np.fft.fftfreq(ny, self.cell[1]),
+            indexing="ij",
+        )
+        self.k2 = self.kx ** 2 + self.ky ** 2
+        self.k2[0, 0] = 1  # the mean flow has no pressure to remove
+
+    def sample(self, field, x, y):
+        """Bilinear interpolation of a grid field at arbitrary points, wrapping around"""
+        gx, gy = x / self.cell[0], y / self.cell[1]
+        i0, j0 = np.floor(gx).astype(np.int64), np.floor(gy).astype(np.int64)
+        fx, fy = gx - i0, gy - j0
+
+        nx, ny = self.shape
+        i0, j0 = i0 % nx, j0 % ny
+        i1, j1 = (i0 + 1) % nx, (j0 + 1) % ny
+        return (
+            field[i0, j0] * (1 - fx) * (1 - fy) + field[i1, j0] * fx * (1 - fy)
+            + field[i0, j1] * (1 - fx) * fy + field[i1, j1] * fx * fy
+        )
+
+    def velocity_at(self, points):
+        """(N, 2) velocities at (N, 2) points"""
+        x, y = points[:, 0], points[:, 1]
+        return np.stack([self.sample(self.u, x, y), self.sample(self.v, x, y)], axis=1)
+
+    def gaussian_force(self, center, vector, radius):
+        """Force field (fu, fv) of a Gaussian blob, using the nearest periodic image"""
+        dx = (self.x - center[0] + self.size[0] / 2) % self.size[0] - self.size[0] / 2
+        dy = (self.y - center[1] + self.size[1] / 2) % self.size[1] - self.size[1] / 2
+        weight = np.exp(-(dx ** 2 + dy ** 2) / radius ** 2)
+        return weight * vector[0], weight * vector[1]
+
+    def step(self, dt, force=None):
+        if force is not None:
+            self.u = self.u + dt * force[0]
+            self.v = self.v + dt * force[1]
+
+        # Trace every grid point back along the flow and take what was there
+        x, y = self.x - dt * self.u, self.y - dt * self.v
+        u, v = self.sample(self.u, x, y), self.sample(self.v, x, y)
+
+        U, V = np.fft.fft2(u), np.fft.fft2(v)
+        damping = 1 / (1 + self.viscosity * dt * self.k2)
+        divergence = (self.kx * U + self.ky * V) / self.k2
+        U = (U - self.kx * divergence) * damping
+        V = (V - self.ky * divergence) * damping
+
+        self.u, self.v = np.fft.ifft2(U).real, np.fft.ifft2(V).real
+
+
+def stirrers(fluid, t, count=3, strength=6.0, radius=0.8, speed=0.4):
+    """Total force of ``count`` jets circling the middle of the domain
+
+    Neighboring jets push in opposite senses, so the flow breaks up into
+    counter-rotating eddies instead of one big vortex.
+    """
+    fu, fv = np.zeros(fluid.shape), np.zeros(fluid.shape)
+    for k in range(count):
+        angle = speed * t + 2 * np.pi * k / count
+        center = fluid.size / 2 + 0.3 * fluid.size * np.array([np.cos(angle), np.sin(angle)])
+        sign = 1 if k % 2 == 0 else -1
+        direction = sign * strength * np.array([-np.sin(angle), np.cos(angle)])
+
+        du, dv = fluid.gaussian_force(center, direction, radius)
+        fu += du
+        fv += dv
+    return fu, fv
+
+
+def fluid_tracers(initial, dt, steps, substeps=2, shape=(128, 72), size=(14.4, 8.1),
+                  viscosity=1e-3, stir=3, strength=6.0, out=None):
+    """Tracer particles carried by a stirred StableFluid
+
+    ``initial`` is (N, 2) in scene coordinates, with the domain centered on
+    the origin. Returns the (steps, N, 2) positions after each dt; they are
+    not wrapped back into the domain (use ``wrap`` when drawing), so samples
+    can be interpolated across the periodic edges. Works with
+    ``dynamics.simulate``.
+    """
+    fluid = StableFluid(shape, size, viscosity)
+    offset = fluid.size / 2
+    points = np.array(initial, dtype=np.float64) + offset
+    if out is None:
+        out = np.empty((steps,) + points.shape)
+
+    h = dt / substeps
+    t = 0.0
+    for k in range(steps):
+        for _ in range(substeps):
+            fluid.step(h, stirrers(fluid, t, stir, strength))
+            # Midpoint rule through the updated velocity field
+            midpoint = points + 0.5 * h * fluid.velocity_at(points)
+            points = points + h * fluid.velocity_at(midpoint)
+            t += h
+        out[k] = points - offset
+    return out
+
+
+def wrap(points, size=(14.4, 8.1)):
+    """Fold positions back into the periodic domain centered on the origin"""
+    size = np.asarray(size)
+    return (points + size / 2) % size - size / 2
@@ -1,78 +1,47 @@
 from manim import *
 import numpy as np
 
+from drawing import ArrowField, EpicycleSystem, TracedCurve
+from epicycles import terms
+from fields import Advection, streamlines
+from particles import ParticleDots
+from raster import DeepZoomImage, MandelbrotImage
+
 
 class FourierEpicyclesAnimated(Scene):
     """Fourier epicycles with actual drawing animation"""
     def construct(self):
         # Parameters
-        num_circles = 6
         radii = [1.2, 0.7, 0.4, 0.25, 0.15, 0.1]
         frequencies = [1, 3, 5, 7, 9, 11]
         colors = [BLUE, TEAL, GREEN, YELLOW, ORANGE, RED]
 
-        # Create circles
-        circles = VGroup()
-        for r, color in zip(radii, colors):
-            circle = Circle(radius=r, color=color, stroke_width=2.5, stroke_opacity=0.6)
-            circles.add(circle)
-
-        # Create dots at endpoints
-        dots = VGroup()
-        for color in colors:
-            dot = Dot(color=color, radius=0.07)
-            dots.add(dot)
-
-        # Lines connecting centers
-        lines = VGroup()
-        for _ in range(num_circles):
-            line = Line(ORIGIN, ORIGIN, color=GREY, stroke_width=1.5, stroke_opacity=0.4)
-            lines.add(line)
+        system = EpicycleSystem(
+            *terms(radii, frequencies),
+            origin=[-3.5, 0, 0],
+            colors=colors,
+            circle_width=2.5,
+            circle_opacity=0.6,
+            arm_opacity=0.4,
+            tip_color=RED,
+            tip_radius=0.07,
+        )
 
         # Path being drawn
-        path = VMobject(color=YELLOW, stroke_width=3)
-        path.set_points_as_corners([ORIGIN, ORIGIN])
+        path = TracedCurve(system.get_tip(), color=YELLOW, stroke_width=3)
 
         # Add everything
-        self.add(circles, lines, dots)
+        self.add(system, path)
 
         # Animate
         t = ValueTracker(0)
 
         def update_system(mob):
-            time = t.get_value()
-            current_center = np.array([-3.5, 0, 0])
-
-            for i in range(num_circles):
-                angle = time * frequencies[i]
-
-                # Update circle position
-                circles[i].move_to(current_center)
-
-                # Calculate endpoint of this circle
-                endpoint = current_center + np.array([
-                    radii[i] * np.cos(angle),
-                    radii[i] * np.sin(angle),
-                    0
-                ])
-
-                # Update line
-                if i < num_circles - 1:
-                    lines[i].put_start_and_end_on(current_center, endpoint)
-
-                # Update dot
-                dots[i].move_to(endpoint)
-
-                # Move to next center
-                current_center = endpoint
-
+            mob.set_time(t.get_value())
             # Add final point to path
-            if path.get_num_points() > 0:
-                path.add_points_as_corners([endpoint])
+            path.add_points_as_corners([mob.get_tip()])
 
-        system = VGroup(circles, lines, dots)
         system.add_updater(update_system)
-        self.add(path)
 
         # Animate over time
         self.play(
@@ -89,67 +58,27 @@ class MandelbrotZoomSpectacular(Scene):
     """More visually striking Mandelbrot with zoom animation"""
     def construct(self):
         # Higher resolution for better quality
-        resolution = 70
+        resolution = 480
         x_range = [-2.5, 1.0]
         y_range = [-1.25, 1.25]
         max_iter = 60
 
-        dots = VGroup()
-
-        for i in range(resolution):
-            for j in range(resolution):
-                x = x_range[0] + (x_range[1] - x_range[0]) * i / resolution
-                y = y_range[0] + (y_range[1] - y_range[0]) * j / resolution
-
-                c = complex(x, y)
-                z = 0
-                iteration = 0
-
-                for n in range(max_iter):
-                    if abs(z) > 2:
-                        iteration = n
-                        break
-                    z = z*z + c
-                else:
-                    iteration = max_iter
-
-                # Enhanced color scheme
-                if iteration < max_iter:
-                    t = iteration / max_iter
-
-                    # Multi-color gradient
-                    if t < 0.16:
-                        color = interpolate_color(BLACK, PURPLE, t * 6)
-                    elif t < 0.33:
-                        color = interpolate_color(PURPLE, BLUE, (t - 0.16) * 6)
-                    elif t < 0.5:
-                        color = interpolate_color(BLUE, TEAL, (t - 0.33) * 6)
-                    elif t < 0.66:
-                        color = interpolate_color(TEAL, GREEN, (t - 0.5) * 6)
-                    elif t < 0.83:
-                        color = interpolate_color(GREEN, YELLOW, (t - 0.66) * 6)
-                    else:
-                        color = interpolate_color(YELLOW, RED, (t - 0.83) * 6)
-
-                    # Map to screen
-                    screen_x = (x + 0.75) * 3.2
-                    screen_y = y * 4.5
-
-                    dot = Dot(
-                        point=np.array([screen_x, screen_y, 0]),
-                        radius=0.05,
-                        color=color,
-                        fill_opacity=0.95
-                    )
-                    dots.add(dot)
-
-        # Fade in with cascade effect
-        self.play(FadeIn(dots, lag_ratio=0.0002), run_time=2)
+        # Multi-color gradient, screen mapping x -> (x + 0.75) * 3.2, y -> y * 4.5
+        fractal = MandelbrotImage(
+            x_range, y_range, resolution, max_iter,
+            colors=[BLACK, PURPLE, BLUE, TEAL, GREEN, YELLOW, RED],
+            opacity=0.95,
+            width=(x_range[1] - x_range[0]) * 3.2,
+            height=(y_range[1] - y_range[0]) * 4.5,
+        )
+
+        # Fade in
+        self.play(FadeIn(fractal), run_time=2)
         self.wait(0.5)
 
         # Zoom into interesting region with rotation
         self.play(
-            dots.animate.scale(2.2).shift(LEFT * 1.5 + DOWN * 0.2).rotate(0.1),
+            fractal.animate.scale(2.2).shift(LEFT * 1.5 + DOWN * 0.2).rotate(0.1),
             run_time=2.5,
             rate_func=smooth
         )
@@ -157,14 +86,45 @@ class MandelbrotZoomSpectacular(Scene):
 
         # Zoom back out
         self.play(
-            dots.animate.scale(1/2.2).shift(RIGHT * 1.5 + UP * 0.2).rotate(-0.1),
+            fractal.animate.scale(1/2.2).shift(RIGHT * 1.5 + UP * 0.2).rotate(-0.1),
             run_time=1.5
         )
         self.wait(0.5)
 
 
+class MandelbrotDeepZoom(Scene):
+    """True deep zoom into Seahorse Valley, recomputing detail every frame"""
+    def construct(self):
+        target = complex(-0.743643887037151, 0.131825904205330)
+        width = 3.5
+        height = width * config.frame_height / config.frame_width
+
+        # One output pixel per screen pixel; tiles are cached across frames
+        fractal = DeepZoomImage(
+            x_range=(target.real - width / 2, target.real + width / 2),
+            y_range=(target.imag - height / 2, target.imag + height / 2),
+            resolution=(config.pixel_width, config.pixel_height),
+            colors=[PURPLE, BLUE, TEAL, GREEN, YELLOW, RED],
+            width=config.frame_width,
+            height=config.frame_height,
+        )
+
+        self.play(FadeIn(fractal), run_time=1)
+
+        # Zoom to 1e-10 of the starting width at a constant apparent speed
+        self.play(
+            fractal.zoom(1e10, anchor=target),
+            run_time=10,
+            rate_func=linear
+        )
+        self.wait(1)
+
+
 class VectorFieldFlowEnhanced(Scene):
     """Beautiful flowing vector field with streamlines"""
+    # The particles are stepped by dt updaters
+    replay_cached_segments = True
+
     def construct(self):
         # Create refined grid
         plane = NumberPlane(
@@ -177,73 +137,51 @@ class VectorFieldFlowEnhanced(Scene):
             }
         )
 
-        # Vector function - vortex
+        # Vector function - vortex, for one point or a batch (..., 3)
         def vector_func(pos):
-            x, y = pos[0], pos[1]
+            x, y = pos[..., 0], pos[..., 1]
             # Circular vortex flow
-            return np.array([-y, x, 0]) * 0.25
-
-        # Create vector field with better spacing
-        vectors = VGroup()
-        for x in np.arange(-4.5, 4.6, 0.6):
-            for y in np.arange(-3.5, 3.6, 0.6):
-                point = np.array([x, y, 0])
-                direction = vector_func(point)
-
-                if np.linalg.norm(direction) > 0.01:
-                    # Color based on magnitude
-                    magnitude = np.linalg.norm(direction)
-                    color = interpolate_color(BLUE, RED, min(magnitude * 2, 1))
-
-                    arrow = Arrow(
-                        point,
-                        point + direction,
-                        color=color,
-                        buff=0,
-                        stroke_width=3,
-                        max_tip_length_to_length_ratio=0.35,
-                        max_stroke_width_to_length_ratio=5
-                    )
-                    vectors.add(arrow)
-
-        # Create flowing particles
-        num_particles = 12
-        particles = VGroup()
-        particle_paths = []
-
-        for i in range(num_particles):
-            angle = i * TAU / num_particles
-            radius = 2.5
-            start_pos = np.array([radius * np.cos(angle), radius * np.sin(angle), 0])
-
-            particle = Dot(start_pos, color=YELLOW, radius=0.08)
-            particles.add(particle)
-
-            # Create traced path
-            path = TracedPath(particle.get_center, stroke_color=YELLOW, stroke_width=2, stroke_opacity=0.4)
-            particle_paths.append(path)
+            return np.stack([-y, x, np.zeros_like(x)], axis=-1) * 0.25
+
+        # Create vector field with better spacing, colored by magnitude
+        vectors = ArrowField(
+            vector_func,
+            np.arange(-4.5, 4.6, 0.6),
+            np.arange(-3.5, 3.6, 0.6),
+            colors=(BLUE, RED),
+            magnitude_range=(0, 0.5),
+            thickness=0.03,
+            max_tip_ratio=0.35,
+        )
+
+        # Evenly spaced streamlines through the whole plane
+        flow_lines = VGroup(*[
+            VMobject(stroke_color=YELLOW, stroke_width=1.5, stroke_opacity=0.3).set_points_as_corners(line)
+            for line in streamlines(vector_func, (-5, 5), (-4, 4), separation=0.6)
+        ])
+
+        # Thousands of flowing particles, integrated together with RK4 and
+        # faded with real transparency over the arrows and streamlines
+        flow = Advection(vector_func, 3000, (-5, 5), (-4, 4), speed=4)
+        particles = ParticleDots(flow.position, color=YELLOW, opacities=flow.opacities(), size=0.04)
 
         # Animate
         self.play(Create(plane), run_time=0.8)
         self.play(Create(vectors, lag_ratio=0.005), run_time=2)
-
-        # Add particles and their paths
-        self.add(particles, *particle_paths)
+        self.play(Create(flow_lines), run_time=1.5)
 
         # Animate particles flowing
-        def update_particle(particle, dt):
-            pos = particle.get_center()
-            velocity = vector_func(pos)
-            new_pos = pos + velocity * dt * 10
-            particle.move_to(new_pos)
+        self.add(particles)
+
+        def update_particles(dots, dt):
+            flow.step(dt)
+            flow.draw(dots)
 
-        for particle in particles:
-            particle.add_updater(update_particle)
+        particles.add_updater(update_particles)
 
         self.wait(3)
 
-        for particle in particles:
-            particle.clear_updaters()
+        particles.clear_updaters()
 
         self.wait(0.5)
 
@@ -0,0 +1,99 @@
+from fractions import Fraction
+
+import av
+import numpy as np
+
+# Variants rendered below each master: (name, height, fps, crf)
+# The smallest loop is what gallery cards autoplay; the master plays in the modal
+LADDER = [
+    ("360p", 360, 30, 30),
+    ("720p", 720, 30, 25),
+]
+
+# Frames darker than this (mean 0-255) don't make a useful poster
+POSTER_MIN_BRIGHTNESS = 8
+
+
+def transcode(source, target, height, fps, crf):
+    """Downscale a master to `height`, dropping frames down to at most `fps`"""
+    with av.open(str(source)) as src, av.open(
+        str(target), "w", options={"movflags": "+faststart"}
+    ) as dst:
+        in_stream = src.streams.video[0]
+        in_fps = in_stream.average_rate or fps
+        step = max(round(in_fps / fps), 1)
+        rate = Fraction(in_fps) / step
+
+        # Keep the aspect ratio with even dimensions, as yuv420p requires
+        in_width = in_stream.codec_context.width
+        in_height = in_stream.codec_context.height
+        width = round(in_width * height / in_height / 2) * 2
+
+        out = dst.add_stream("libx264", rate=rate)
+        out.width, out.height = width, height
+        out.pix_fmt = "yuv420p"
+        out.options = {"crf": str(crf), "preset": "slow"}
+
+        count = 0
+        for index, frame in enumerate(src.decode(in_stream)):
+            if index % step:
+                continue
+            frame = frame.reformat(width=width, height=height, format="yuv420p")
+            frame.pts = count
+            frame.time_base = 1 / rate
+            count += 1
+            dst.mux(out.encode(frame))
+
+        dst.mux(out.encode())
+
+
+def poster(source, target, max_seconds=3):
+    """Save the first frame as a JPEG poster
+
+    Most scenes open on an empty black frame, so leading frames that are
+    (nearly) black are skipped, up to max_seconds in.
+    """
+    with av.open(str(source)) as src:
+        stream = src.streams.video[0]
+        limit = int((stream.average_rate or 60) * max_seconds)
+
+        first = chosen = None
+        for index, frame in enumerate(src.decode(stream)):
+            if first is None:
+                first = frame
+            if np.asarray(frame.to_ndarray(format="gray")).mean() >= POSTER_MIN_BRIGHTNESS:
+                chosen = frame
+                break
+            if index >= limit:
+                break
+
+    if first is None:
+        raise ValueError(f"{source} has no video frames to make a poster from")
+    # All dark: fall back to the first frame
+    (chosen or first).to_image().save(str(target), quality=85)
+
+
+def ladder_paths(master):
+    """Variant name -> path for the files derived from a master video"""
+    return {name: master.with_name(f"{master.stem}.{name}.mp4") for name, *_ in LADDER}
+
+
+def build_ladder(master, master_height, force=False):
+    """Render the variants below the master's height, plus its poster
+
+    Existing files are kept unless ``force`` is set. Returns
+    ({name: path}, poster_path) for the variants that apply to this master.
+    """
+    paths = ladder_paths(master)
+    variants = {}
+    for name, height, fps, crf in LADDER:
+        if height >= master_height:
+            continue
+        variants[name] = paths[name]
+        if force or not paths[name].exists():
+            transcode(master, paths[name], height, fps, crf)
+
+    poster_path = master.with_suffix(".jpg")
+    if force or not poster_path.exists():
+        poster(master, poster_path)
+    return variants, poster_path
@@ -0,0 +1,305 @@
+import numpy as np
+
+
+def neighbor_counts(grid):
+    """Live neighbors of every cell, wrapping around the edges (a torus)"""
+    grid = grid.astype(np.uint8, copy=False)
+
+    # Sum the column of three first, then three of those columns side by side
+    columns = grid + np.roll(grid, 1, axis=0) + np.roll(grid, -1, axis=0)
+    return columns + np.roll(columns, 1, axis=1) + np.roll(columns, -1, axis=1) - grid
+
+
+def step(grid):
+    """One Game of Life generation, with the same dtype as ``grid``"""
+    counts = neighbor_counts(grid)
+    alive = (counts == 3) | ((counts == 2) & (grid != 0))
+    return alive.astype(grid.dtype)
+
+
+# The Gosper glider gun as (row, column) cells, rows counted downwards. It
+# has period 30 and sends a glider towards the bottom right every period.
+GOSPER_GLIDER_GUN = [
+    (0, 24),
+    (1, 22), (1, 24),
+    (2, 12), (2, 13), (2, 20), (2, 21), (2, 34), (2, 35),
+    (3, 11), (3, 15), (3, 20), (3, 21), (3, 34), (3, 35),
+    (4, 0), (4, 1), (4, 10), (4, 16), (4, 20), (4, 21),
+    (5, 0), (5, 1), (5, 10), (5, 14), (5, 16), (5, 17), (5, 22), (5, 24),
+    (6, 10), (6, 16), (6, 24),
+    (7, 11), (7, 15),
+    (8, 12), (8, 13),
+]
+
+
+def place(cells, shape, offset=(0, 0), dtype=np.int64):
+    """Grid of the given shape with ``cells`` (row, column pairs) set to 1"""
+    grid = np.zeros(shape, dtype=dtype)
+    rows, cols = np.asarray(cells).T + np.reshape(offset, (2, 1))
+    grid[rows, cols] = 1
+    return grid
+
+
+class DenseLife:
+    """Whole-board stepping on a torus, the same as ``step``
+
+    All engines share this interface: ``advance(generations)`` moves the
+    pattern forward and ``window(shape)`` returns the cells with row and
+    column in [0, shape), in the coordinates of the starting grid.
+    """
+    def __init__(self, grid):
+        self.grid = np.asarray(grid)
+        self.generation = 0
+
+    @property
+    def population(self):
+        return int(np.count_nonzero(self.grid))
+
+    def advance(self, generations=1):
+        for _ in range(generations):
+            self.grid = step(self.grid)
+        self.generation += generations
+        return self
+
+    def window(self, shape):
+        rows, cols = shape
+        return self.grid[:rows, :cols]
+
+
+# Coordinates are biased to be non-negative before packing; patterns can
+# wander about a billion cells either way before this overflows
+_BIAS = 1 << 30
+
+
+def _encode(cells):
+    # Pack (row, column) pairs into one sortable integer each
+    return (cells[:, 0] + _BIAS) << 32 | (cells[:, 1] + _BIAS)
+
+
+def _decode(keys):
+    return np.stack([(keys >> 32) - _BIAS, (keys & 0xFFFFFFFF) - _BIAS], axis=1)
+
+
+_NEIGHBORS = np.array([(di, dj) for di in (-1, 0, 1) for dj in (-1, 0, 1) if di or dj])
+
+
+class SparseLife:
+    """Live cells kept as a set of coordinates on an unbounded plane
+
+    Each generation costs time proportional to the population instead of
+    the board area, which suits large, mostly empty patterns.
+    """
+    def __init__(self, grid):
+        grid = np.asarray(grid)
+        self.shape = grid.shape
+        self.live = np.sort(_encode(np.argwhere(grid).astype(np.int64)))
+        self.generation = 0
+
+    @property
+    def population(self):
+        return len(self.live)
+
+    def step(self):
+        cells = _decode(self.live)
+        neighbors = (cells[:, None, :] + _NEIGHBORS[None]).reshape(-1, 2)
+        keys, counts = np.unique(_encode(neighbors), return_counts=True)
+
+        alive = np.isin(keys, self.live, assume_unique=True)
+        self.live = keys[(counts == 3) | ((counts == 2) & alive)]
+        self.generation += 1
+
+    def advance(self, generations=1):
+        for _ in range(generations):
+            self.step()
+        return self
+
+    def window(self, shape):
+        cells = _decode(self.live)
+        inside = np.all((cells >= 0) & (cells < shape), axis=1)
+
+        grid = np.zeros(shape, dtype=np.uint8)
+        grid[cells[inside, 0], cells[inside, 1]] = 1
+        return grid
+
+
+class _Node:
+    """Quadtree node of size 2**k with quadrants a b / c d (rows downwards)"""
+    __slots__ = ("k", "a", "b", "c", "d", "n")
+
+    def __init__(self, k, a, b, c, d, n):
+        self.k, self.a, self.b, self.c, self.d, self.n = k, a, b, c, d, n
+
+
+class HashLife:
+    """Gosper's Hashlife on an unbounded plane
+
+    The pattern is a quadtree whose nodes are shared between identical
+    regions, and the future of every node is memoized, so repetitive
+    patterns can be advanced by thousands of generations at a time. Nodes
+    are interned for the lifetime of the engine.
+    """
+    def __init__(self, grid):
+        grid = np.asarray(grid)
+        self.shape = grid.shape
+        self.generation = 0
+
+        self._nodes = {}
+        self._successors = {}
+        self._off = _Node(0, None, None, None, None, 0)
+        self._on = _Node(0, None, None, None, None, 1)
+        self._zeros = [self._off]
+
+        k = max(int(np.ceil(np.log2(max(grid.shape)))), 3)
+        self.root = self._build(k, np.argwhere(grid))
+        # Board coordinates of the root's top left corner
+        self.origin = np.zeros(2, dtype=np.int64)
+
+    @property
+    def population(self):
+        return self.root.n
+
+    def _join(self, a, b, c, d):
+        key = (a, b, c, d)
+        node = self._nodes.get(key)
+        if node is None:
+            node = _Node(a.k + 1, a, b, c, d, a.n + b.n + c.n + d.n)
+            self._nodes[key] = node
+        return node
+
+    def _zero(self, k):
+        while len(self._zeros) <= k:
+            z = self._zeros[-1]
+            self._zeros.append(self._join(z, z, z, z))
+        return self._zeros[k]
+
+    def _build(self, k, cells):
+        if len(cells) == 0:
+            return self._zero(k)
+        if k == 0:
+            return self._on
+
+        half = 1 << (k - 1)
+        bottom, right = cells[:, 0] >= half, cells[:, 1] >= half
+        offset = np.array([half, half])
+        return self._join(
+            self._build(k - 1, cells[~bottom & ~right]),
+            self._build(k - 1, cells[~bottom & right] - offset * [0, 1]),
+            self._build(k - 1, cells[bottom & ~right] - offset * [1, 0]),
+            self._build(k - 1, cells[bottom & right] - offset),
+        )
+
+    def _centre(self, node):
+        """Node twice the size with ``node`` in the middle"""
+        z = self._zero(node.k - 1)
+        return self._join(
+            self._join(z, z, z, node.a),
+            self._join(z, z, node.b, z),
+            self._join(z, node.c, z, z),
+            self._join(node.d, z, z, z),
+        )
+
+    def _life_4x4(self, m):
+        """Middle 2x2 of a 4x4 node, one generation on"""
+        cells = np.array([
+            [m.a.a.n, m.a.b.n, m.b.a.n, m.b.b.n],
+            [m.a.c.n, m.a.d.n, m.b.c.n, m.b.d.n],
+            [m.c.a.n, m.c.b.n, m.d.a.n, m.d.b.n],
+            [m.c.c.n, m.c.d.n, m.d.c.n, m.d.d.n],
+        ])
+        out = []
+        for i, j in ((1, 1), (1, 2), (2, 1), (2, 2)):
+            neighbors = cells[i - 1:i + 2, j - 1:j + 2].sum() - cells[i, j]
+            out.append(self._on if neighbors == 3 or (neighbors == 2 and cells[i, j]) else self._off)
+        return self._join(*out)
+
+    def _successor(self, m, j):
+        """Middle half of m, 2**j generations on (j <= m.k - 2)"""
+        j = min(j, m.k - 2)
+        key = (m, j)
+        if key in self._successors:
+            return self._successors[key]
+
+        if m.n == 0:
+            result = m.a
+        elif m.k == 2:
+            result = self._life_4x4(m)
+        else:
+            a, b, c, d = m.a, m.b, m.c, m.d
+            join = self._join
+            # Nine overlapping sub-squares of half the size
+            parts = [
+                a, join(a.b, b.a, a.d, b.c), b,
+                join(a.c, a.d, c.a, c.b), join(a.d, b.c, c.b, d.a), join(b.c, b.d, d.a, d.b),
+                c, join(c.b, d.a, c.d, d.c), d,
+            ]
+            s = [self._successor(part, j) for part in parts]
+
+            quads = [(0, 1, 3, 4), (1, 2, 4, 5), (3, 4, 6, 7), (4, 5, 7, 8)]
+            if j < m.k - 2:
+                # Already far enough: take the middles without stepping again
+                result = join(*[
+                    join(s[p].d, s[q].c, s[r].b, s[t].a) for p, q, r, t in quads
+                ])
+            else:
+                result = join(*[
+                    self._successor(join(s[p], s[q], s[r], s[t]), j) for p, q, r, t in quads
+                ])
+
+        self._successors[key] = result
+        return result
+
+    def _grow(self):
+        self.origin -= 1 << (self.root.k - 1)
+        self.root = self._centre(self.root)
+
+    def _padded(self):
+        # Everything alive must sit in the middle half of the root
+        r = self.root
+        return (r.k >= 3 and r.a.n == r.a.d.n and r.b.n == r.b.c.n
+                and r.c.n == r.c.b.n and r.d.n == r.d.a.n)
+
+    def _jump(self, j):
+        """Advance exactly 2**j generations"""
+        while not self._padded() or self.root.k - 2 < j:
+            self._grow()
+        # One more level so nothing can outrun the returned middle half
+        self._grow()
+        self.origin += 1 << (self.root.k - 2)
+        self.root = self._successor(self.root, j)
+        self.generation += 1 << j
+
+    def advance(self, generations=1):
+        j = 0
+        while generations:
+            if generations & 1:
+                self._jump(j)
+            generations >>= 1
+            j += 1
+        return self
+
+    def window(self, shape):
+        grid = np.zeros(shape, dtype=np.uint8)
+        self._paint(self.root, self.origin[0], self.origin[1], grid)
+        return grid
+
+    def _paint(self, node, top, left, grid):
+        size = 1 << node.k
+        rows, cols = grid.shape
+        if node.n == 0 or top >= rows or left >= cols or top + size <= 0 or left + size <= 0:
+            return
+        if node.k == 0:
+            grid[top, left] = 1
+            return
+
+        half = size >> 1
+        self._paint(node.a, top, left, grid)
+        self._paint(node.b, top, left + half, grid)
+        self._paint(node.c, top + half, left, grid)
+        self._paint(node.d, top + half, left + half, grid)
+
+
+ENGINES = {
+    "dense": DenseLife,
+    "sparse": SparseLife,
+    "hashlife": HashLife,
+}
@@ -0,0 +1,305 @@
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+# Worker processes for escape-time grids; results are identical for any count
+WORKERS = int(os.environ.get("MANDELBROT_WORKERS", os.cpu_count() or 1))
+
+# Below this many points the pool round trip costs more than it saves
+PARALLEL_MIN_POINTS = 1 << 16
+
+_pools = {}
+
+
+def complex_grid(x_range, y_range, resolution):
+    """Complex plane sample points, indexed [i, j] with i along x and j along y"""
+    if np.isscalar(resolution):
+        resolution = (resolution, resolution)
+    nx, ny = resolution
+
+    # Same arithmetic order as the original per-pixel loops, so the sample
+    # points (and therefore the iteration counts) match exactly
+    xs = x_range[0] + (x_range[1] - x_range[0]) * np.arange(nx) / nx
+    ys = y_range[0] + (y_range[1] - y_range[0]) * np.arange(ny) / ny
+
+    return xs[:, None] + 1j * ys[None, :]
+
+
+def _escape(c, max_iter):
+    """Iteration counts and raw smooth values (n + 1 - log2(log|z|))"""
+    c = np.asarray(c, dtype=np.complex128)
+    z = np.zeros_like(c)
+    counts = np.full(c.shape, max_iter, dtype=np.int32)
+    active = np.ones(c.shape, dtype=bool)
+
+    for n in range(max_iter):
+        escaped_now = active & (np.abs(z) > 2)
+        counts[escaped_now] = n
+        active &= ~escaped_now
+
+        if not active.any():
+            break
+
+        # Only iterate the points still inside, escaped z values stay frozen
+        z[active] = z[active] * z[active] + c[active]
+
+    escaped = counts < max_iter
+    nu = np.zeros(c.shape, dtype=np.float64)
+    magnitude = np.abs(z[escaped])
+    nu[escaped] = counts[escaped] + 1 - np.log2(np.log(np.maximum(magnitude, 2)))
+
+    return counts, nu
+
+
+def _get_pool(workers):
+    # Pools are kept for the life of the process so per-frame recomputation
+    # doesn't pay worker startup every time
+    if workers not in _pools:
+        _pools[workers] = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pools[workers]
+
+
+def shutdown_pools():
+    """Stop the worker pools, waiting for their processes to exit"""
+    for pool in _pools.values():
+        pool.shutdown()
+    _pools.clear()
+
+
+def _escape_band(names, shape, band, bands, max_iter):
+    """Worker: iterate rows band, band + bands, ... in place in the shared arrays"""
+    segments = [SharedMemory(name=name, track=False) for name in names]
+    c = np.ndarray(shape, dtype=np.complex128, buffer=segments[0].buf)
+    counts = np.ndarray(shape, dtype=np.int32, buffer=segments[1].buf)
+    nu = np.ndarray(shape, dtype=np.float64, buffer=segments[2].buf)
+
+    rows = slice(band, None, bands)
+    counts[rows], nu[rows] = _escape(c[rows], max_iter)
+
+    # Views must go before the segments can be closed
+    del c, counts, nu
+    for segment in segments:
+        segment.close()
+
+
+def _parallel_escape(c, max_iter, workers):
+    """_escape split into row bands across a process pool
+
+    Input and outputs live in shared memory, so workers read their band and
+    write results in place instead of pickling arrays back and forth.
+    """
+    shape = c.shape
+    dtypes = (np.complex128, np.int32, np.float64)
+    segments = [
+        SharedMemory(create=True, size=max(c.size * np.dtype(dtype).itemsize, 1))
+        for dtype in dtypes
+    ]
+    try:
+        shared = [np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+                  for dtype, segment in zip(dtypes, segments)]
+        shared[0][...] = c
+
+        # Interleaved rows: points inside the set cost max_iter each and
+        # cluster together, so contiguous bands would leave workers idle
+        bands = min(workers, shape[0])
+        names = [segment.name for segment in segments]
+        futures = [
+            _get_pool(workers).submit(_escape_band, names, shape, band, bands, max_iter)
+            for band in range(bands)
+        ]
+        for future in futures:
+            future.result()
+
+        # Hand back ordinary arrays so the segments can be released
+        counts, nu = shared[1].copy(), shared[2].copy()
+        del shared
+    finally:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+    return counts, nu
+
+
+def escape_time(c, max_iter, workers=None):
+    """Vectorized escape-time iteration of z -> z*z + c
+
+    Returns (counts, smooth, escaped):
+      counts  - first n < max_iter with |z_n| > 2, or max_iter if none
+      smooth  - continuous iteration value, normalized to [0, 1]
+      escaped - boolean mask of points with counts < max_iter
+
+    Large grids are split across ``workers`` processes (default WORKERS);
+    the output is identical to the single-process path.
+    """
+    counts, nu = _escape_any(c, max_iter, workers)
+    return counts, np.clip(nu / max_iter, 0, 1), counts < max_iter
+
+
+def _escape_any(c, max_iter, workers=None):
+    c = np.asarray(c, dtype=np.complex128)
+    workers = WORKERS if workers is None else workers
+
+    if workers <= 1 or c.size < PARALLEL_MIN_POINTS or c.ndim == 0:
+        return _escape(c, max_iter)
+    return _parallel_escape(c, max_iter, workers)
+
+
+def mandelbrot(x_range, y_range, resolution, max_iter, workers=None):
+    """Escape-time grid for a rectangle of the complex plane"""
+    c = complex_grid(x_range, y_range, resolution)
+    return escape_time(c, max_iter, workers)
+
+
+def adaptive_max_iter(zoom, base_iter=64, iter_per_octave=48):
+    """Iteration budget that grows with zoom depth so boundary detail survives"""
+    return int(base_iter + iter_per_octave * max(np.log2(zoom), 0))
+
+
+class TileCache:
+    """Escape-time tiles on a power-of-two pyramid, reused between frames
+
+    Level L samples the plane at pixel size ``base_pixel / 2**L`` on a grid
+    anchored at 0, cut into ``tile_size`` square tiles keyed by
+    (level, tx, ty, max_iter), i.e. the tile's center, scale and iteration
+    budget. A zoom keeps using the same level for several frames, so only
+    tiles scrolling into view are computed. Pixel sizes are powers of two,
+    which makes every sample of level L an exact sample of level L + 1:
+    a new tile copies the points its parent already saw escape.
+    """
+    def __init__(self, base_pixel=2.0 ** -8, tile_size=128, max_tiles=1024,
+                 base_iter=64, iter_per_octave=48, workers=None):
+        self.base_pixel = base_pixel
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self.base_iter = base_iter
+        self.iter_per_octave = iter_per_octave
+        self.workers = workers
+        self.tiles = OrderedDict()
+        self.computed = 0
+        self.reused = 0
+
+    def __deepcopy__(self, memo):
+        # Mobject copies (animation start states, FadeIn targets) should keep
+        # sharing one cache rather than duplicating every tile
+        return self
+
+    def max_iter_for(self, level):
+        return adaptive_max_iter(2.0 ** level, self.base_iter, self.iter_per_octave)
+
+    def level_for(self, pixel_size):
+        """Coarsest level whose pixels are at least as fine as pixel_size"""
+        return max(int(np.ceil(np.log2(self.base_pixel / pixel_size))), 0)
+
+    def tile(self, level, tx, ty):
+        return self.tiles_for(level, [(tx, ty)])[0]
+
+    def tiles_for(self, level, coords):
+        """Tiles at one level, computing all missing ones in a single batch"""
+        max_iter = self.max_iter_for(level)
+        keys = [(level, tx, ty, max_iter) for tx, ty in coords]
+        missing = [key for key in dict.fromkeys(keys) if key not in self.tiles]
+
+        # Seed every missing tile from its parent, then iterate all unknown
+        # points of the batch together so the worker pool sees one big grid
+        seeded = [self._seed_tile(level, tx, ty) for _, tx, ty, _ in missing]
+        if seeded:
+            c = np.concatenate([tile_c[~known] for tile_c, _, _, known in seeded])
+            counts, nu = _escape_any(c, max_iter, self.workers)
+
+            offset = 0
+            for key, (_, tile_counts, tile_nu, known) in zip(missing, seeded):
+                n = np.count_nonzero(~known)
+                tile_counts[~known] = counts[offset:offset + n]
+                tile_nu[~known] = nu[offset:offset + n]
+                offset += n
+                self.tiles[key] = (tile_counts, tile_nu)
+            self.computed += len(missing)
+
+        self.reused += len(keys) - len(missing)
+        result = []
+        for key in keys:
+            self.tiles.move_to_end(key)
+            result.append(self.tiles[key])
+
+        while len(self.tiles) > self.max_tiles:
+            self.tiles.popitem(last=False)
+        return result
+
+    def _seed_tile(self, level, tx, ty):
+        size = self.tile_size
+        pixel = self.base_pixel / 2.0 ** level
+
+        # Integer pixel indices times a power-of-two pixel size are exact
+        xs = (tx * size + np.arange(size)) * pixel
+        ys = (ty * size + np.arange(size)) * pixel
+        c = xs[:, None] + 1j * ys[None, :]
+
+        counts = np.empty((size, size), dtype=np.int32)
+        nu = np.empty((size, size), dtype=np.float64)
+        known = np.zeros((size, size), dtype=bool)
+
+        # Even pixels coincide with the parent level's samples; an escape
+        # count below the parent's budget doesn't depend on max_iter
+        parent_key = (level - 1, tx // 2, ty // 2, self.max_iter_for(level - 1))
+        if level > 0 and parent_key in self.tiles:
+            parent_counts, parent_nu = self.tiles[parent_key]
+            half = size // 2
+            ox, oy = (tx % 2) * half, (ty % 2) * half
+            sub_counts = parent_counts[ox:ox + half, oy:oy + half]
+
+            counts[::2, ::2] = sub_counts
+            nu[::2, ::2] = parent_nu[ox:ox + half, oy:oy + half]
+            known[::2, ::2] = sub_counts < parent_key[3]
+
+        return c, counts, nu, known
+
+    def view(self, x_range, y_range, resolution):
+        """Escape-time grid for a viewport, assembled from cached tiles
+
+        Returns (counts, nu, escaped, max_iter) indexed [i, j] like
+        ``mandelbrot``; ``nu`` is the raw smooth iteration value.
+        """
+        if np.isscalar(resolution):
+            resolution = (resolution, resolution)
+        nx, ny = resolution
+        size = self.tile_size
+
+        pixel_x = (x_range[1] - x_range[0]) / nx
+        pixel_y = (y_range[1] - y_range[0]) / ny
+        level = self.level_for(min(pixel_x, pixel_y))
+        pixel = self.base_pixel / 2.0 ** level
+        max_iter = self.max_iter_for(level)
+
+        # Nearest level sample for each output pixel center
+        xs = x_range[0] + (np.arange(nx) + 0.5) * pixel_x
+        ys = y_range[0] + (np.arange(ny) + 0.5) * pixel_y
+        ix = np.round(xs / pixel).astype(np.int64)
+        iy = np.round(ys / pixel).astype(np.int64)
+
+        tx0, tx1 = ix.min() // size, ix.max() // size
+        ty0, ty1 = iy.min() // size, iy.max() // size
+
+        coords = [(tx, ty) for tx in range(tx0, tx1 + 1) for ty in range(ty0, ty1 + 1)]
+        tiles = self.tiles_for(level, coords)
+
+        mosaic_counts = np.empty(((tx1 - tx0 + 1) * size, (ty1 - ty0 + 1) * size), dtype=np.int32)
+        mosaic_nu = np.empty(mosaic_counts.shape, dtype=np.float64)
+        for (tx, ty), (counts, nu) in zip(coords, tiles):
+            sx = slice((tx - tx0) * size, (tx - tx0 + 1) * size)
+            sy = slice((ty - ty0) * size, (ty - ty0 + 1) * size)
+            mosaic_counts[sx, sy] = counts
+            mosaic_nu[sx, sy] = nu
+
+        gx = (ix - tx0 * size)[:, None]
+        gy = (iy - ty0 * size)[None, :]
+        counts = mosaic_counts[gx, gy]
+
+        return counts, mosaic_nu[gx, gy], counts < max_iter, max_iter
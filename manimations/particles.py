@@ -0,0 +1,235 @@
+from manim import *
+import numpy as np
+
+
+def color_array(colors, count):
+    """(count, 3) RGB array from one color, a list of colors or an RGB array"""
+    if isinstance(colors, np.ndarray) and colors.ndim == 2:
+        return np.broadcast_to(colors, (count, 3)).astype(np.float64)
+    if isinstance(colors, list):
+        return np.array([ManimColor(color).to_rgb() for color in colors])
+    return np.tile(ManimColor(colors).to_rgb(), (count, 1))
+
+
+class ParticleCloud(PMobject):
+    """Many particles as one point cloud, with per-particle color and opacity
+
+    Positions live in ``points`` (N, 3); ``colors`` (N, 3) and
+    ``opacities`` (N,) are kept alongside. Point clouds are drawn opaque, so
+    opacity is applied by blending each color towards the background: only
+    use it over an empty backdrop, as fading particles would cover anything
+    behind them with background-colored squares. ParticleDots draws with
+    real transparency. ``size`` is the particle diameter in scene units.
+    """
+    def __init__(self, positions, colors=WHITE, opacities=1.0, size=0.1, **kwargs):
+        positions = np.asarray(positions, dtype=np.float64)
+        self.size = size
+        super().__init__(stroke_width=size * config.pixel_height / config.frame_height, **kwargs)
+
+        count = len(positions)
+        self.colors = color_array(colors, count)
+        self.opacities = np.broadcast_to(np.asarray(opacities, dtype=np.float64), (count,)).copy()
+        self.set_positions(positions)
+
+    def set_positions(self, positions):
+        """Move every particle; (N, 2) positions are placed at z = 0"""
+        positions = np.asarray(positions)
+        points = np.zeros((len(positions), 3))
+        points[:, :positions.shape[1]] = positions
+        self.points = points
+        self.update_rgbas()
+        return self
+
+    def set_particles(self, positions, colors=None, opacities=None):
+        """Replace every particle at once; the count may change between frames
+
+        Colors and opacities left out are kept, so the count must not change then.
+        """
+        if colors is not None:
+            self.colors = np.asarray(colors, dtype=np.float64)
+        if opacities is not None:
+            self.opacities = np.asarray(opacities, dtype=np.float64)
+        return self.set_positions(positions)
+
+    def set_colors(self, colors=None, opacities=None):
+        if colors is not None:
+            self.colors = color_array(colors, len(self.points))
+        if opacities is not None:
+            self.opacities = np.broadcast_to(np.asarray(opacities, dtype=np.float64), (len(self.points),)).copy()
+        return self.update_rgbas()
+
+    def update_rgbas(self):
+        background = ManimColor(config.background_color).to_rgb()
+        alpha = np.clip(self.opacities, 0, 1)[:, None]
+        self.rgbas = np.ones((len(self.points), 4))
+        self.rgbas[:, :3] = background + (self.colors - background) * alpha
+        return self
+
+    def set_opacity(self, opacity, family=True):
+        return self.set_colors(opacities=opacity)
+
+    def fade(self, darkness=0.5, family=True):
+        # FadeIn/FadeOut fade a copy; blend it towards the background too
+        return self.set_colors(opacities=self.opacities * (1 - darkness))
+
+
+class ParticleDots(VGroup):
+    """Many particles of one color as a few filled VMobjects, with real transparency
+
+    Each particle is a small circle, and the circles are split into
+    ``opacity_bins`` VMobjects by opacity, so whatever is behind them shows
+    through as it would for separate Dots. Costlier to draw than a
+    ParticleCloud; use it over other content. ``size`` is the particle
+    diameter in scene units.
+    """
+    def __init__(self, positions, color=WHITE, opacities=1.0, size=0.1, opacity_bins=8, **kwargs):
+        super().__init__(**kwargs)
+        self.size = size
+        # Bezier points of one particle around the origin, moved into place per particle
+        self.unit_circle = Circle(radius=size / 2).points
+        self.add(*[
+            VMobject(fill_color=color, fill_opacity=k / opacity_bins, stroke_width=0)
+            for k in range(1, opacity_bins + 1)
+        ])
+        self.set_particles(positions, opacities)
+
+    def set_particles(self, positions, opacities=None):
+        """Move every particle, setting their opacities if given; the count may change"""
+        positions = np.asarray(positions, dtype=np.float64)
+        points = np.zeros((len(positions), 3))
+        points[:, :positions.shape[1]] = positions
+        if opacities is not None:
+            self.opacities = np.broadcast_to(np.asarray(opacities, dtype=np.float64), (len(points),)).copy()
+
+        # Rounded up, so only fully transparent particles are left out
+        bins = np.ceil(np.clip(self.opacities, 0, 1) * len(self)).astype(int) - 1
+        for k, dots in enumerate(self):
+            dots.set_points((self.unit_circle + points[bins == k, None]).reshape(-1, 3))
+        return self
+
+
+class MoveParticles(Animation):
+    """Drive a ParticleCloud with vectorized functions of time
+
+    ``positions(t)`` returns the (N, 2) or (N, 3) positions and
+    ``opacities(t)``, if given, the (N,) opacities, for t from 0 to 1 after
+    the rate function.
+    """
+    def __init__(self, cloud, positions, opacities=None, **kwargs):
+        self.positions = positions
+        self.opacities = opacities
+        super().__init__(cloud, **kwargs)
+
+    def interpolate_mobject(self, alpha):
+        t = self.rate_func(alpha)
+        if self.opacities is not None:
+            self.mobject.opacities = np.broadcast_to(self.opacities(t), len(self.mobject.points)).copy()
+        self.mobject.set_positions(self.positions(t))
+
+
+def spiral(base, growth=1.5, turn=0.5):
+    """Rotate by ``turn`` radians about the origin while moving out by ``growth``"""
+    base = np.asarray(base)
+    radius = np.hypot(base[:, 0], base[:, 1])
+    angle = np.arctan2(base[:, 1], base[:, 0])
+
+    def positions(t):
+        r = radius * (1 + (growth - 1) * t)
+        points = base.copy()
+        points[:, 0] = r * np.cos(angle + turn * t)
+        points[:, 1] = r * np.sin(angle + turn * t)
+        return points
+    return positions
+
+
+class ParticlePool:
+    """Fixed-capacity particle storage as structure-of-arrays buffers
+
+    Every particle has a slot in ``position``, ``velocity`` (N, 2), ``age``,
+    ``lifetime`` (N,) and ``color`` (N, 3); ``alive`` marks the slots in use.
+    Particles that outlive their lifetime free their slot for new ones, so
+    nothing is allocated while a scene runs.
+    """
+    def __init__(self, capacity, gravity=(0.0, -4.0), drag=1.0):
+        self.capacity = capacity
+        self.gravity = np.asarray(gravity, dtype=np.float64)
+        self.drag = drag
+
+        self.position = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.age = np.zeros(capacity)
+        self.lifetime = np.ones(capacity)
+        self.color = np.zeros((capacity, 3))
+        self.alive = np.zeros(capacity, dtype=bool)
+
+    def spawn(self, position, velocity, lifetime, color):
+        """Put new particles in free slots; those that don't fit are dropped"""
+        slots = np.flatnonzero(~self.alive)[:len(velocity)]
+        count = len(slots)
+
+        self.position[slots] = position
+        self.velocity[slots] = velocity[:count]
+        self.age[slots] = 0
+        self.lifetime[slots] = lifetime[:count]
+        self.color[slots] = color[:count]
+        self.alive[slots] = True
+        return count
+
+    def step(self, dt):
+        """Advance every live particle: gravity, then linear drag, then motion"""
+        live = self.alive
+        self.velocity[live] += self.gravity * dt
+        self.velocity[live] *= np.exp(-self.drag * dt)
+        self.position[live] += self.velocity[live] * dt
+        self.age[live] += dt
+        self.alive &= self.age < self.lifetime
+
+    def opacities(self):
+        """Live particles fade out linearly over their lifetime"""
+        return 1 - self.age[self.alive] / self.lifetime[self.alive]
+
+    def draw(self, cloud):
+        """Show the live particles on a ParticleCloud"""
+        live = self.alive
+        return cloud.set_particles(self.position[live], self.color[live], self.opacities())
+
+
+class Emitter:
+    """Launches particles into a ParticlePool from one point
+
+    Directions are spread over ``spread`` radians around ``direction``,
+    speeds and lifetimes are uniform in their (low, high) ranges, and colors
+    follow the ``colors`` gradient across the spread. ``rate`` particles per
+    second are emitted by ``emit``; ``burst`` launches a number at once.
+    """
+    def __init__(self, pool, position=ORIGIN, rate=1000, direction=0.0, spread=TAU,
+                 speed=(2.0, 5.0), lifetime=(1.0, 2.0), colors=(BLUE, RED), seed=0):
+        self.pool = pool
+        self.position = np.asarray(position, dtype=np.float64)[:2]
+        self.rate = rate
+        self.direction = direction
+        self.spread = spread
+        self.speed = speed
+        self.lifetime = lifetime
+        self.stops = np.array([ManimColor(color).to_rgb() for color in colors])
+        self.rng = np.random.default_rng(seed)
+        self.pending = 0.0
+
+    def burst(self, count):
+        fraction = self.rng.random(count)
+        angle = self.direction + (fraction - 0.5) * self.spread
+        speed = self.rng.uniform(*self.speed, count)
+        velocity = np.stack([np.cos(angle), np.sin(angle)], axis=1) * speed[:, None]
+
+        color = np.stack([
+            np.interp(fraction, np.linspace(0, 1, len(self.stops)), self.stops[:, k])
+            for k in range(3)
+        ], axis=1)
+        return self.pool.spawn(self.position, velocity, self.rng.uniform(*self.lifetime, count), color)
+
+    def emit(self, dt):
+        """Emit ``rate * dt`` particles, carrying fractions over between frames"""
+        self.pending += self.rate * dt
+        count = int(self.pending)
+        self.pending -= count
+        return self.burst(count) if count else 0
@@ -0,0 +1,237 @@
+from manim import *
+import numpy as np
+
+from mandelbrot import TileCache, mandelbrot
+
+
+def gradient_colormap(values, colors, opacity=1.0):
+    """Map values in [0, 1] to a uint8 RGBA array through evenly spaced color stops"""
+    stops = np.linspace(0, 1, len(colors))
+    rgbs = np.array([ManimColor(color).to_rgb() for color in colors])
+
+    rgba = np.empty(values.shape + (4,), dtype=np.float64)
+    for k in range(3):
+        rgba[..., k] = np.interp(values, stops, rgbs[:, k])
+    rgba[..., 3] = opacity
+
+    return (rgba * 255).astype(np.uint8)
+
+
+class MandelbrotImage(ImageMobject):
+    """Mandelbrot set rendered into a single image instead of one Dot per pixel
+
+    Escaped points are colored with a gradient over the normalized iteration
+    count, points inside the set are left transparent. With ``escape_limit``
+    only points escaping in fewer iterations are colored.
+    """
+    def __init__(
+        self,
+        x_range=(-2.5, 1.0),
+        y_range=(-1.25, 1.25),
+        resolution=400,
+        max_iter=60,
+        colors=(BLUE, RED),
+        smooth=False,
+        opacity=1.0,
+        escape_limit=None,
+        width=None,
+        height=None,
+        **kwargs
+    ):
+        self.x_range = tuple(x_range)
+        self.y_range = tuple(y_range)
+        self.resolution = resolution
+        self.max_iter = max_iter
+        self.colors = colors
+        self.smooth = smooth
+        self.fill_alpha = opacity
+        self.escape_limit = escape_limit
+
+        super().__init__(self.compute_pixels(), **kwargs)
+
+        if width is not None:
+            self.stretch_to_fit_width(width)
+        if height is not None:
+            self.stretch_to_fit_height(height)
+
+    def compute_pixels(self):
+        counts, smooth, escaped = mandelbrot(
+            self.x_range, self.y_range, self.resolution, self.max_iter
+        )
+        values = smooth if self.smooth else counts / self.max_iter
+
+        rgba = gradient_colormap(values, self.colors, self.fill_alpha)
+        rgba[~escaped] = 0
+        if self.escape_limit is not None:
+            rgba[counts >= self.escape_limit] = 0
+
+        return self.to_image(rgba)
+
+    @staticmethod
+    def to_image(rgba):
+        # Grid is indexed [x, y]; images are rows from top to bottom
+        return rgba.transpose(1, 0, 2)[::-1].copy()
+
+    def set_viewport(self, x_range, y_range, max_iter=None):
+        """Recompute the fractal for a new region, keeping the on-screen placement"""
+        self.x_range = tuple(x_range)
+        self.y_range = tuple(y_range)
+        if max_iter is not None:
+            self.max_iter = max_iter
+
+        self.pixel_array = self.compute_pixels()
+        return self
+
+    def set_resolution(self, resolution):
+        """Recompute the same region with more or fewer pixels, keeping the on-screen placement"""
+        self.resolution = resolution
+        self.pixel_array = self.compute_pixels()
+        return self
+
+    def point_to_complex(self, point):
+        """Complex plane coordinate under a scene point (handles rotated images)"""
+        ul, ur, dl = self.points[0], self.points[1], self.points[2]
+        basis = np.array([ur - ul, ul - dl])[:, :2].T
+        u, v = np.linalg.solve(basis, (np.asarray(point) - dl)[:2])
+
+        return complex(
+            self.x_range[0] + u * (self.x_range[1] - self.x_range[0]),
+            self.y_range[0] + v * (self.y_range[1] - self.y_range[0]),
+        )
+
+    def zoom(self, factor, about_point=ORIGIN, recompute=True, **kwargs):
+        """Zoom animation, either recomputing detail or just magnifying pixels"""
+        if recompute:
+            return ZoomFractal(self, factor, about_point, **kwargs)
+        return self.animate(**kwargs).scale(factor, about_point=about_point)
+
+
+class DeepZoomImage(MandelbrotImage):
+    """MandelbrotImage backed by a TileCache, for zooms many octaves deep
+
+    The iteration budget follows the zoom depth, and colors cycle every
+    ``color_period`` iterations so the palette holds up as it grows.
+    """
+    def __init__(self, x_range, y_range, resolution, colors=(BLUE, RED),
+                 color_period=64, cache=None, **kwargs):
+        self.cache = cache if cache is not None else TileCache()
+        self.color_period = color_period
+        super().__init__(x_range, y_range, resolution, colors=colors, **kwargs)
+
+    def compute_pixels(self):
+        counts, nu, escaped, self.max_iter = self.cache.view(
+            self.x_range, self.y_range, self.resolution
+        )
+        values = (nu % self.color_period) / self.color_period
+
+        # Close the palette so the cycle wraps without a seam
+        colors = list(self.colors) + [self.colors[0]]
+        rgba = gradient_colormap(values, colors, self.fill_alpha)
+        rgba[~escaped] = 0
+
+        return self.to_image(rgba)
+
+
+class ZoomFractal(Animation):
+    """Zoom into a MandelbrotImage by recomputing its viewport every frame
+
+    The image stays where it is on screen; the complex point under
+    ``about_point`` (or ``anchor``, given directly in the complex plane)
+    stays fixed while the region shrinks by ``factor``.
+    """
+    def __init__(self, mobject, factor, about_point=ORIGIN, anchor=None, **kwargs):
+        self.factor = factor
+        self.about_point = about_point
+        self.anchor = anchor
+        super().__init__(mobject, **kwargs)
+
+    def begin(self):
+        self.start_x_range = np.array(self.mobject.x_range)
+        self.start_y_range = np.array(self.mobject.y_range)
+        if self.anchor is None:
+            self.anchor = self.mobject.point_to_complex(self.about_point)
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        # Geometric interpolation keeps the apparent zoom speed constant
+        scale = self.factor ** self.rate_func(alpha)
+        x_range = self.anchor.real + (self.start_x_range - self.anchor.real) / scale
+        y_range = self.anchor.imag + (self.start_y_range - self.anchor.imag) / scale
+        self.mobject.set_viewport(x_range, y_range)
+
+
+class CellGrid(ImageMobject):
+    """Grid of two-state cells drawn as one image instead of a Square per cell
+
+    ``grid[i][j]`` is the cell in row i (counted upwards) and column j. Each
+    cell covers ``pixels_per_cell`` texture pixels, by default about as many
+    as it covers on screen, with faint grid lines when cells are big enough
+    to show them. ``set_grid`` can also show a crossfade part of the way
+    into the next generation.
+    """
+    def __init__(
+        self,
+        grid,
+        cell_size=0.2,
+        alive_color=BLUE,
+        dead_color=BLACK,
+        alive_opacity=0.9,
+        dead_opacity=0.0,
+        line_color=WHITE,
+        line_opacity=0.3,
+        pixels_per_cell=None,
+        **kwargs
+    ):
+        self.grid = np.asarray(grid)
+        self.cell_size = cell_size
+        self.alive_rgba = np.append(ManimColor(alive_color).to_rgb(), alive_opacity)
+        self.dead_rgba = np.append(ManimColor(dead_color).to_rgb(), dead_opacity)
+        self.line_rgba = np.append(ManimColor(line_color).to_rgb(), line_opacity)
+        if pixels_per_cell is None:
+            pixels_per_cell = round(cell_size * config.pixel_height / config.frame_height)
+        self.pixels_per_cell = max(pixels_per_cell, 1)
+
+        super().__init__(self.compute_pixels(), **kwargs)
+        self.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+
+        rows, cols = self.grid.shape
+        self.stretch_to_fit_width(cols * cell_size)
+        self.stretch_to_fit_height(rows * cell_size)
+
+    def compute_pixels(self, grid=None):
+        grid = self.grid if grid is None else grid
+        alive = np.asarray(grid).astype(bool)[::-1, :, None]
+        rgba = np.where(alive, self.alive_rgba, self.dead_rgba)
+
+        size = self.pixels_per_cell
+        rgba = rgba.repeat(size, axis=0).repeat(size, axis=1)
+
+        # One-pixel lines along the top and left edge of every cell, closed
+        # off at the bottom and right of the board
+        if size >= 4:
+            lines = np.zeros(rgba.shape[:2], dtype=bool)
+            lines[::size] = lines[:, ::size] = True
+            lines[-1] = lines[:, -1] = True
+
+            # Lines drawn over the cell color ("over" compositing, straight alpha)
+            cells = rgba[lines]
+            line_alpha = self.line_rgba[3]
+            cell_alpha = cells[:, 3:] * (1 - line_alpha)
+            out_alpha = line_alpha + cell_alpha
+            rgba[lines, :3] = (self.line_rgba[:3] * line_alpha + cells[:, :3] * cell_alpha) / np.maximum(out_alpha, 1e-9)
+            rgba[lines, 3] = out_alpha[:, 0]
+
+        return (rgba * 255).astype(np.uint8)
+
+    def set_grid(self, grid, next_grid=None, alpha=0.0):
+        """Show a new generation, or ``alpha`` of the way through a crossfade into ``next_grid``
+
+        The board must keep its shape.
+        """
+        self.grid = np.asarray(grid)
+        pixels = self.compute_pixels()
+        if next_grid is not None and alpha > 0:
+            blended = pixels * (1 - alpha) + self.compute_pixels(next_grid) * alpha
+            pixels = blended.round().astype(np.uint8)
+        self.pixel_array = pixels
+        return self
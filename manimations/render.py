@@ -0,0 +1,569 @@
+import argparse
+import ast
+import hashlib
+import importlib.metadata
+import importlib.util
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+MEDIA_DIR = HERE / "media"
+CACHE_DIR = MEDIA_DIR / "render_cache"
+PUBLIC_VIDEOS = HERE.parent / "webapp" / "public" / "videos"
+MANIFEST = PUBLIC_VIDEOS / "manifest.json"
+
+# Gallery modules, in the order they appear in the webapp
+SCENE_MODULES = [
+    "animations.py",
+    "advanced_animations.py",
+    "improved_animations.py",
+    "stunning_animations.py",
+    "ai_ml_animations.py",
+    "ai_visual_simple.py",
+]
+
+# Videos served by the webapp, and the module each one is rendered from
+GALLERY = [
+    ("ai_visual_simple.py", "AttentionMechanism"),
+    ("ai_visual_simple.py", "NeuralNetworkActivation"),
+    ("ai_visual_simple.py", "GradientDescent"),
+    ("ai_visual_simple.py", "EmbeddingSpace"),
+    ("ai_visual_simple.py", "ContextWindow"),
+    ("ai_visual_simple.py", "TemperatureSampling"),
+    ("animations.py", "FourierCircles"),
+    ("animations.py", "WaveInterference"),
+    ("animations.py", "FibonacciSpiral"),
+    ("animations.py", "ParticleSystem"),
+    ("animations.py", "GeometricTransformations"),
+    ("animations.py", "VectorField"),
+    ("advanced_animations.py", "FluidParticles"),
+    ("advanced_animations.py", "FractalTree"),
+    ("improved_animations.py", "FourierEpicyclesAnimated"),
+    ("improved_animations.py", "MandelbrotZoomSpectacular"),
+    ("improved_animations.py", "VectorFieldFlowEnhanced"),
+    ("stunning_animations.py", "MandelbrotSetVisualization"),
+    ("stunning_animations.py", "LorenzAttractorPath"),
+    ("stunning_animations.py", "FourierSeriesDrawing"),
+    ("stunning_animations.py", "DoublePendulumChaos"),
+    ("stunning_animations.py", "SortingVisualization"),
+]
+
+# Same shorthand as manim's -q flag
+QUALITIES = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+# Output folder manim uses for each quality (pixel height + frame rate)
+QUALITY_DIRS = {
+    "low_quality": "480p15",
+    "medium_quality": "720p30",
+    "high_quality": "1080p60",
+    "production_quality": "1440p60",
+    "fourk_quality": "2160p60",
+}
+
+SCENE_BASES = {"Scene", "MovingCameraScene", "ThreeDScene", "ZoomedScene"}
+
+# Partial movies manim keeps per scene; the default (100) can evict segments
+# of long scenes that are still current
+SEGMENTS_CACHED = 1000
+
+RANDOM_SEED = 0
+
+RenderResult = namedtuple("RenderResult", "path name movie seconds error cached reused segments")
+
+
+def discover_scenes(modules=SCENE_MODULES):
+    """(module path, class name) for every Scene subclass, without importing manim"""
+    scenes = []
+    for module in modules:
+        path = HERE / module
+        tree = ast.parse(path.read_text(), filename=str(path))
+
+        # Subclasses of scenes defined earlier in the same module count too
+        known = set(SCENE_BASES)
+        for node in tree.body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            bases = {base.id for base in node.bases if isinstance(base, ast.Name)}
+            if bases & known:
+                known.add(node.name)
+                scenes.append((path, node.name))
+    return scenes
+
+
+def _definitions(tree):
+    """Module-level functions, classes and assigned names"""
+    definitions = {}
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            definitions[node.name] = node
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    definitions[target.id] = node
+    return definitions
+
+
+def _sibling_imports(tree, directory):
+    """Names bound by imports of other modules in this directory -> module path"""
+    imported = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            module = directory / f"{node.module}.py"
+            if module.exists():
+                for alias in node.names:
+                    imported[alias.asname or alias.name] = module
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                module = directory / f"{alias.name}.py"
+                if module.exists():
+                    imported[alias.asname or alias.name] = module
+    return imported
+
+
+def scene_sources(path, scene_name):
+    """Source text a scene's output depends on
+
+    The scene class, the module-level helpers it references (transitively),
+    and the whole source of any sibling module those names come from, along
+    with that module's own sibling imports.
+    """
+    source = path.read_text()
+    tree = ast.parse(source)
+    definitions = _definitions(tree)
+    imported = _sibling_imports(tree, path.parent)
+
+    chunks = {}
+    modules = set()
+    pending = [scene_name]
+    while pending:
+        name = pending.pop()
+        if name in imported:
+            modules.add(imported[name])
+        if name in chunks or name not in definitions:
+            continue
+
+        node = definitions[name]
+        chunks[name] = ast.get_source_segment(source, node)
+        pending.extend(n.id for n in ast.walk(node) if isinstance(n, ast.Name))
+
+    pending = list(modules)
+    while pending:
+        module = pending.pop()
+        for dependency in set(_sibling_imports(ast.parse(module.read_text()), module.parent).values()):
+            if dependency not in modules:
+                modules.add(dependency)
+                pending.append(dependency)
+
+    return [chunks[name] for name in sorted(chunks)] + [
+        module.read_text() for module in sorted(modules)
+    ]
+
+
+def manim_version():
+    try:
+        return importlib.metadata.version("manim")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def scene_fingerprint(path, scene_name, quality):
+    """Content hash of everything that decides what a scene renders to"""
+    digest = hashlib.sha256()
+    for part in [scene_name, manim_version(), quality, *scene_sources(path, scene_name)]:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def cache_path(fingerprint):
+    return CACHE_DIR / fingerprint[:2] / f"{fingerprint}.mp4"
+
+
+def movie_path(path, scene_name, quality, media_dir=None):
+    """Where manim writes a scene's movie"""
+    return (media_dir or MEDIA_DIR) / "videos" / Path(path).stem / QUALITY_DIRS[quality] / f"{scene_name}.mp4"
+
+
+def copy_file(source, destination):
+    """Copy into place through a temporary file, replacing whatever was there
+
+    Never a hardlink: manim rewrites its output movies in place, which
+    would change every other name for the same file.
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    temporary = destination.with_name(f".{destination.name}.tmp")
+    shutil.copy2(source, temporary)
+    os.replace(temporary, destination)
+
+
+def load_module(path):
+    path = Path(path).resolve()
+
+    # Scene modules import their helpers as siblings, like `manim file.py` allows
+    if str(path.parent) not in sys.path:
+        sys.path.insert(0, str(path.parent))
+
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[path.stem] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _replay_cached_segments(scene):
+    """Step segments manim finds in its partial movie cache instead of skipping them
+
+    Manim skips a cached play() by jumping straight to its end, running
+    updaters once with dt = run_time. That is exact for animations and for
+    updaters driven by a tracker, but a dt-driven updater (a particle
+    simulation, say) would take one huge step, leaving every later segment,
+    and its hash, different from a full render. A jump can't be made exact
+    for those, so this steps cached segments frame by frame, without drawing
+    or encoding anything. It costs the updaters' time for every cached frame
+    and hooks manim internals, so it is opt-in: scenes with dt updaters set
+    ``replay_cached_segments = True``, and ``--replay-cached`` turns it on
+    for every scene.
+    """
+    get_time_progression = scene.get_time_progression
+    play_internal = scene.play_internal
+
+    def stepped_time_progression(run_time, description="", n_iterations=None,
+                                 override_skip_animations=False):
+        return get_time_progression(run_time, description, n_iterations, True)
+
+    def stepped_play_internal(skip_rendering=False):
+        play_internal(skip_rendering)
+        # A rendered play ends with this too
+        if scene.renderer.skip_animations:
+            scene.update_mobjects(0)
+
+    scene.get_time_progression = stepped_time_progression
+    scene.play_internal = stepped_play_internal
+
+
+def render_scene(module_path, scene_name, quality, media_dir=None, replay=False):
+    """Render one scene in this process
+
+    Returns (movie path, seconds, segments reused, segments). Every play()
+    and wait() is a segment: manim hashes the animation and the mobjects on
+    screen, and segments whose partial movie already exists from an earlier
+    render are reused instead of re-encoded. With ``replay``, or for scenes
+    that ask for it, reused segments are stepped through; see
+    ``_replay_cached_segments``.
+    """
+    import numpy as np
+    from manim import tempconfig
+
+    start = time.perf_counter()
+    scene_class = getattr(load_module(module_path), scene_name)
+
+    # Unseeded randomness would change segment hashes on every render
+    random.seed(RANDOM_SEED)
+    np.random.seed(RANDOM_SEED)
+
+    with tempconfig({
+        "quality": quality,
+        "media_dir": str(media_dir or MEDIA_DIR),
+        "input_file": str(module_path),
+        "progress_bar": "none",
+        "verbosity": "WARNING",
+        "disable_caching": False,
+        "max_files_cached": SEGMENTS_CACHED,
+    }):
+        scene = scene_class()
+        if replay or getattr(scene_class, "replay_cached_segments", False):
+            _replay_cached_segments(scene)
+
+        file_writer = scene.renderer.file_writer
+        partial_dir = Path(file_writer.partial_movie_directory)
+        existing = set(partial_dir.glob("*.mp4"))
+
+        scene.render()
+        movie = file_writer.movie_file_path
+        segments = [Path(f) for f in file_writer.partial_movie_files if f is not None]
+
+    reused = sum(segment in existing for segment in segments)
+    return Path(movie), time.perf_counter() - start, reused, len(segments)
+
+
+def render_all(scenes, quality="high_quality", jobs=None, force=False, replay=False):
+    """Render scenes concurrently, one fresh process per scene
+
+    Scenes whose fingerprint already has a cached movie are not rendered;
+    the cached file is copied back into manim's usual output location.
+    Yields a RenderResult per scene as it finishes; movie and seconds are
+    None for a failed render.
+    """
+    jobs = jobs or os.cpu_count() or 1
+
+    pending = []
+    for path, name in scenes:
+        fingerprint = scene_fingerprint(path, name, quality)
+        cached = cache_path(fingerprint)
+        if cached.exists() and not force:
+            movie = movie_path(path, name, quality)
+            copy_file(cached, movie)
+            yield RenderResult(path, name, movie, 0.0, None, True, None, None)
+        else:
+            pending.append((path, name, cached))
+
+    if not pending:
+        return
+
+    # Share the machine between concurrent renders instead of letting every
+    # Mandelbrot scene start a full-width pool of its own
+    os.environ.setdefault("MANDELBROT_WORKERS", str(max((os.cpu_count() or 1) // jobs, 1)))
+
+    # A fresh interpreter per scene keeps manim's global config from leaking
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=1,
+    ) as pool:
+        futures = {
+            pool.submit(render_scene, path, name, quality, None, replay): (path, name, cached)
+            for path, name, cached in pending
+        }
+        for future in as_completed(futures):
+            path, name, cached = futures[future]
+            try:
+                movie, seconds, reused, segments = future.result()
+            except Exception as error:
+                yield RenderResult(path, name, None, None, error, False, None, None)
+                continue
+
+            copy_file(movie, cached)
+            yield RenderResult(path, name, movie, seconds, None, False, reused, segments)
+
+
+def gallery_scenes():
+    return [(HERE / module, name) for module, name in GALLERY]
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def probe_video(path):
+    """Duration, resolution and frame rate, read with PyAV (a manim dependency)"""
+    import av
+
+    with av.open(str(path)) as container:
+        stream = container.streams.video[0]
+        duration = container.duration / av.time_base if container.duration else float(
+            stream.duration * stream.time_base
+        )
+        return {
+            "duration": round(duration, 3),
+            "width": stream.codec_context.width,
+            "height": stream.codec_context.height,
+            "fps": round(float(stream.average_rate), 3),
+        }
+
+
+def load_manifest():
+    if MANIFEST.exists():
+        return json.loads(MANIFEST.read_text())
+    return {}
+
+
+def publish(quality="high_quality"):
+    """Copy current gallery renders into the webapp and rewrite the manifest
+
+    Each published video also gets its lower-resolution variants and a
+    poster frame (see ladder.py), listed in its manifest entry.
+
+    Only a movie cached under the scene's current fingerprint is published,
+    so the webapp never picks up a render of outdated source. Scenes without
+    one keep their previous video and manifest entry. Returns the names that
+    could not be published.
+    """
+    from ladder import build_ladder
+
+    previous = load_manifest()
+    manifest = {}
+    unpublished = []
+
+    for path, name in gallery_scenes():
+        fingerprint = scene_fingerprint(path, name, quality)
+        cached = cache_path(fingerprint)
+        target = PUBLIC_VIDEOS / f"{name}.mp4"
+
+        if cached.exists():
+            copy_file(cached, target)
+        else:
+            unpublished.append(name)
+            fingerprint = previous.get(name, {}).get("fingerprint")
+            if not target.exists():
+                continue
+
+        info = probe_video(target)
+        sha256 = file_hash(target)
+
+        # Variants are derived from the master, so redo them when it changes
+        force = previous.get(name, {}).get("sha256") != sha256
+        variants, poster_path = build_ladder(target, info["height"], force)
+        variants[f"{info['height']}p"] = target
+
+        manifest[name] = {
+            "file": f"/videos/{target.name}",
+            "module": path.name,
+            "size": target.stat().st_size,
+            **info,
+            "sha256": sha256,
+            "fingerprint": fingerprint,
+            "poster": f"/videos/{poster_path.name}",
+            # Smallest first; the last entry is the master itself
+            "variants": [
+                {
+                    "name": variant,
+                    "file": f"/videos/{variant_path.name}",
+                    "size": variant_path.stat().st_size,
+                    **probe_video(variant_path),
+                }
+                for variant, variant_path in variants.items()
+            ],
+        }
+
+    MANIFEST.write_text(json.dumps(manifest, indent=2) + "\n")
+    return unpublished
+
+
+def check_gallery(quality="high_quality"):
+    """(missing, stale) gallery scenes according to the manifest alone"""
+    manifest = load_manifest()
+    missing, stale = [], []
+
+    for path, name in gallery_scenes():
+        entry = manifest.get(name)
+        if entry is None or not (PUBLIC_VIDEOS / f"{name}.mp4").exists():
+            missing.append(name)
+        elif entry.get("fingerprint") != scene_fingerprint(path, name, quality):
+            stale.append(name)
+    return missing, stale
+
+
+def scene_key(path, scene_name):
+    """``<module>:<Scene>``, unique even where modules reuse a class name"""
+    return f"{Path(path).stem}:{scene_name}"
+
+
+def _normalize_name(name):
+    module, qualified, scene_name = name.rpartition(":")
+    return f"{Path(module).stem}:{scene_name}" if qualified else name
+
+
+def select_scenes(scenes, names):
+    """Scenes given by class name (in every module defining it) or as ``module:Scene``"""
+    if not names:
+        return scenes
+
+    wanted = {_normalize_name(name) for name in names}
+    selected = [
+        (path, name) for path, name in scenes
+        if name in wanted or scene_key(path, name) in wanted
+    ]
+    found = {name for _, name in selected} | {scene_key(path, name) for path, name in selected}
+    missing = wanted - found
+    if missing:
+        raise SystemExit(f"Unknown scene(s): {', '.join(sorted(missing))}")
+    return selected
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="manimations",
+        description="Render every gallery scene in parallel",
+    )
+    parser.add_argument("scenes", nargs="*",
+                        help="scene class names or module:Scene (default: all)")
+    parser.add_argument("-q", "--quality", choices=QUALITIES, default="h",
+                        help="manim quality flag (default: h, 1080p60)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="scenes rendered at once (default: CPU count)")
+    parser.add_argument("--force", action="store_true",
+                        help="re-render even if a cached movie matches")
+    parser.add_argument("--replay-cached", action="store_true",
+                        help="step through reused segments in every scene, not only "
+                             "those with dt-driven updaters")
+    parser.add_argument("--gallery", action="store_true",
+                        help="only the scenes published to the webapp")
+    parser.add_argument("--publish", action="store_true",
+                        help="after rendering, copy gallery videos into the webapp "
+                             "and rewrite its manifest")
+    parser.add_argument("--check", action="store_true",
+                        help="report missing or stale webapp videos and exit")
+    parser.add_argument("--list", action="store_true", help="list scenes and exit")
+    args = parser.parse_args(argv)
+    quality = QUALITIES[args.quality]
+
+    if args.check:
+        missing, stale = check_gallery(quality)
+        for name in missing:
+            print(f"{name:<28} missing")
+        for name in stale:
+            print(f"{name:<28} stale")
+        if not MANIFEST.exists():
+            print(f"No {MANIFEST.name} yet; run with --gallery --publish to write it")
+        if missing or stale:
+            sys.exit(1)
+        print(f"All {len(GALLERY)} gallery videos are up to date")
+        return
+
+    scenes = gallery_scenes() if args.gallery else discover_scenes()
+    scenes = select_scenes(scenes, args.scenes)
+
+    if args.list:
+        for path, name in scenes:
+            print(f"{path.name:<26} {name}")
+        return
+
+    start = time.perf_counter()
+    failures = cached = 0
+    for result in render_all(scenes, quality, args.jobs, args.force, args.replay_cached):
+        label = f"{result.name:<28} {result.path.name:<26}"
+        if result.error is not None:
+            failures += 1
+            print(f"{label} {'-':>9}  FAILED: {result.error}")
+        elif result.cached:
+            cached += 1
+            print(f"{label} {'-':>9}  cached")
+        else:
+            print(f"{label} {result.seconds:8.1f}s  ok, "
+                  f"{result.reused}/{result.segments} segments reused")
+
+    print(
+        f"\n{len(scenes)} scenes in {time.perf_counter() - start:.1f}s, "
+        f"{cached} cached, {failures} failed"
+    )
+
+    if args.publish:
+        unpublished = publish(quality)
+        print(f"Published {len(GALLERY) - len(unpublished)} videos to {PUBLIC_VIDEOS}")
+        if unpublished:
+            print(f"Not rendered for current source: {', '.join(unpublished)}")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-import { useState } from "react";
+import { useEffect, useState } from "react";
 import { InlineMath, BlockMath } from "react-katex";
 import "katex/dist/katex.min.css";
 import "./App.css";
@@ -201,10 +201,16 @@ const animations = [
   },
 ];
 
-function AnimationCard({ animation, onClick }) {
+// Scene name of a gallery video, which keys its manifest entry
+const sceneName = (video) => video.split("/").pop().replace(/\.mp4$/, "");
+
+function AnimationCard({ animation, media, onClick }) {
   const [isPlaying, setIsPlaying] = useState(false);
   const isAI = animation.category === "AI & Machine Learning";
 
+  // Cards loop the smallest variant; the full master is left for the modal
+  const preview = media?.variants?.[0]?.file ?? animation.video;
+
   return (
     <div
       className={`animation-card ${isAI ? "ai-card" : ""}`}
@@ -212,7 +218,9 @@ function AnimationCard({ animation, onClick }) {
     >
       <div className="video-container">
         <video
-          src={animation.video}
+          src={preview}
+          poster={media?.poster}
+          preload={media?.poster ? "none" : "metadata"}
           loop
           muted
           playsInline
@@ -237,7 +245,7 @@ function AnimationCard({ animation, onClick }) {
   );
 }
 
-function AnimationModal({ animation, onClose }) {
+function AnimationModal({ animation, media, onClose }) {
   const [playbackRate, setPlaybackRate] = useState(1);
   const [isPlaying, setIsPlaying] = useState(true);
   const [showPlayIcon, setShowPlayIcon] = useState(false);
@@ -283,6 +291,7 @@ function AnimationModal({ animation, onClose }) {
               <video
                 ref={videoRef}
                 src={animation.video}
+                poster={media?.poster}
                 className="modal-video"
                 autoPlay
                 loop
@@ -350,6 +359,17 @@ function AnimationModal({ animation, onClose }) {
 
 function App() {
   const [selectedAnimation, setSelectedAnimation] = useState(null);
+  const [manifest, setManifest] = useState({});
+
+  // Written by `manimations --publish`; without it the masters are used as-is
+  useEffect(() => {
+    fetch("/videos/manifest.json")
+      .then((response) => (response.ok ? response.json() : {}))
+      .then(setManifest)
+      .catch(() => {});
+  }, []);
+
+  const mediaFor = (animation) => manifest[sceneName(animation.video)];
 
   // Separate AI and non-AI animations
   const aiAnimations = animations.filter(
@@ -382,6 +402,7 @@ function App() {
               <AnimationCard
                 key={animation.id}
                 animation={animation}
+                media={mediaFor(animation)}
                 onClick={() => setSelectedAnimation(animation)}
                 style={{ "--card-index": index }}
               />
@@ -403,6 +424,7 @@ function App() {
               <AnimationCard
                 key={animation.id}
                 animation={animation}
+                media={mediaFor(animation)}
                 onClick={() => setSelectedAnimation(animation)}
                 style={{ "--card-index": index }}
               />
@@ -418,6 +440,7 @@ function App() {
       {selectedAnimation && (
         <AnimationModal
           animation={selectedAnimation}
+          media={mediaFor(selectedAnimation)}
           onClose={() => setSelectedAnimation(null)}
         />
       )}